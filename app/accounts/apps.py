@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "accounts"
+
+    def ready(self):
+        from accounts.models import Country, Department
+        from backend.cache import invalidate_on_change
+
+        invalidate_on_change(Country, Department)
@@ -0,0 +1,92 @@
+from accounts.models import User
+from django.core import signing
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+TOKEN_VERSION_CLAIM = "token_version"
+CALENDAR_TOKEN_PARAM = "token"
+CALENDAR_TOKEN_SALT = "accounts.calendar"
+
+
+def add_user_claims(token, user):
+    """
+    Put everything permissions and querysets need to know about the user
+    into the token, so requests can be authenticated without loading the user
+    """
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+    for field in User.TOKEN_CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+    return token
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds the user from token claims.
+
+    The user is loaded from the database only when the token version
+    does not match the current one (role or department has changed since
+    the token was issued) or the token was issued without user claims.
+    """
+
+    def get_user(self, validated_token):
+        claim_names = (
+            api_settings.USER_ID_CLAIM,
+            TOKEN_VERSION_CLAIM,
+            *User.TOKEN_CLAIM_FIELDS,
+        )
+        if any(name not in validated_token for name in claim_names):
+            return super().get_user(validated_token)
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        token_version = validated_token[TOKEN_VERSION_CLAIM]
+        if User.objects.get_token_version(user_id) != token_version:
+            return super().get_user(validated_token)
+
+        values = {
+            "id": user_id,
+            TOKEN_VERSION_CLAIM: token_version,
+            **{field: validated_token[field] for field in User.TOKEN_CLAIM_FIELDS},
+        }
+        # Same as what `User.objects.only(...)` would load, other fields are
+        # fetched lazily on first access
+        field_names = [
+            field.attname
+            for field in User._meta.concrete_fields
+            if field.attname in values
+        ]
+        return User.from_db(
+            DEFAULT_DB_ALIAS, field_names, [values[name] for name in field_names]
+        )
+
+
+def make_calendar_token(user):
+    """
+    Token for the URL of the calendar feed, calendar clients subscribe to
+    a plain URL and can not send an Authorization header. It is bound to
+    the token version, so it is revoked together with issued JWTs
+    """
+    return signing.dumps([user.id, user.token_version], salt=CALENDAR_TOKEN_SALT)
+
+
+class CalendarTokenAuthentication(BaseAuthentication):
+    """
+    Authenticates by a token from `make_calendar_token` in the query string
+    """
+
+    def authenticate(self, request):
+        token = request.query_params.get(CALENDAR_TOKEN_PARAM)
+        if token is None:
+            return None
+        try:
+            user_id, token_version = signing.loads(token, salt=CALENDAR_TOKEN_SALT)
+        except (signing.BadSignature, TypeError, ValueError):
+            raise AuthenticationFailed("Invalid calendar token")
+        user = User.objects.filter(
+            pk=user_id, token_version=token_version, is_active=True
+        ).first()
+        if user is None:
+            raise AuthenticationFailed("Invalid calendar token")
+        return user, token
@@ -0,0 +1,241 @@
+import csv
+from itertools import islice
+from pathlib import Path
+
+from accounts.models import (
+    Country,
+    Education,
+    ImportProgress,
+    TraineeProfile,
+    User,
+    WorkExperience,
+)
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from openpyxl import load_workbook
+
+CANDIDATE = "candidate"
+EDUCATION = "education"
+WORK_EXPERIENCE = "work_experience"
+
+USER_FIELDS = ["first_name", "last_name"]
+PROFILE_FIELDS = ["phone_number", "birth_date", "sex", "bio"]
+EDUCATION_FIELDS = [
+    "name",
+    "type",
+    "start_year",
+    "end_year",
+    "specialization",
+    "degree",
+    "description",
+]
+WORK_EXPERIENCE_FIELDS = [
+    "employer",
+    "position",
+    "start_date",
+    "end_date",
+    "description",
+]
+
+
+def read_rows(path):
+    """
+    Streams rows of a CSV or XLSX file as dicts keyed by the header row
+    """
+    if path.suffix.lower() == ".xlsx":
+        workbook = load_workbook(path, read_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(name).strip() for name in next(rows)]
+        for row in rows:
+            yield {
+                name: "" if value is None else value for name, value in zip(header, row)
+            }
+        workbook.close()
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            yield from csv.DictReader(file)
+
+
+def _text(row, name):
+    # csv.DictReader fills missing columns of short rows with None
+    return str(row.get(name) or "").strip()
+
+
+def _values(number, model, row, field_names):
+    """
+    Converts non-empty columns to python values, empty ones are left
+    to the model defaults
+    """
+    values = {}
+    for name in field_names:
+        value = row.get(name)
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == "":
+            continue
+        try:
+            values[name] = model._meta.get_field(name).to_python(value)
+        except ValidationError as e:
+            raise CommandError(f"Row {number}: {name}: {' '.join(e.messages)}")
+    return values
+
+
+def _validate(number, obj, field_names):
+    exclude = [f.name for f in obj._meta.fields if f.name not in field_names]
+    try:
+        obj.clean_fields(exclude=exclude)
+    except ValidationError as e:
+        raise CommandError(f"Row {number}: {e.message_dict}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Импорт кандидатов из CSV/XLSX файла. Каждая строка содержит колонки "
+        f"record ({CANDIDATE}, {EDUCATION} или {WORK_EXPERIENCE}) и email "
+        "кандидата, остальные колонки совпадают с полями моделей. "
+        "Колонка password может содержать готовый хеш пароля, иначе пароль "
+        "не задается. Прогресс сохраняется в базе вместе с каждой пачкой и "
+        "удаляется после успешного импорта, прерванный импорт продолжается "
+        "с места остановки с флагом --resume."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path, help="CSV or XLSX file")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--checkpoint",
+            help="Name the import progress is saved under, the file name by default",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted import after the last saved row",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not path.exists():
+            raise CommandError(f"File {path} does not exist")
+        checkpoint = options["checkpoint"] or path.name
+        batch_size = options["batch_size"]
+
+        progress = ImportProgress.objects.filter(source=checkpoint).first()
+        if options["resume"]:
+            if progress is None:
+                raise CommandError(f"No interrupted import {checkpoint!r} to resume")
+            self.stdout.write(f"Resuming after row {progress.rows}")
+        elif progress is not None:
+            raise CommandError(
+                f"Import {checkpoint!r} was interrupted after row {progress.rows}, "
+                "pass --resume to continue it"
+            )
+        else:
+            progress = ImportProgress(source=checkpoint)
+        done = progress.rows
+        self.countries = dict(Country.objects.values_list("name", "id"))
+
+        rows = enumerate(islice(read_rows(path), done, None), start=done + 1)
+        created = 0
+        while batch := list(islice(rows, batch_size)):
+            with transaction.atomic():
+                created += self.import_batch(batch)
+                done = progress.rows = batch[-1][0]
+                progress.save()
+            self.stdout.write(f"Imported {done} rows, {created} new candidates")
+        if progress.pk:
+            # A later file with the same name is a new import
+            progress.delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Done: {done} rows, {created} new candidates")
+        )
+
+    def import_batch(self, batch):
+        records = {CANDIDATE: [], EDUCATION: [], WORK_EXPERIENCE: []}
+        for number, row in batch:
+            record = _text(row, "record")
+            if record not in records:
+                raise CommandError(f"Row {number}: unknown record type {record!r}")
+            records[record].append((number, row))
+
+        users = self.create_candidates(records[CANDIDATE])
+        emails = {
+            _text(row, "email")
+            for number, row in records[EDUCATION] + records[WORK_EXPERIENCE]
+        }
+        profile_ids = dict(
+            User.objects.filter(username__in=emails).values_list("username", "id")
+        )
+        self.create_related(
+            Education, EDUCATION_FIELDS, records[EDUCATION], profile_ids
+        )
+        self.create_related(
+            WorkExperience,
+            WORK_EXPERIENCE_FIELDS,
+            records[WORK_EXPERIENCE],
+            profile_ids,
+        )
+        return len(users)
+
+    def create_candidates(self, rows):
+        emails = [_text(row, "email") for number, row in rows]
+        existing = set(
+            User.objects.filter(username__in=emails).values_list("username", flat=True)
+        )
+        users, profiles = [], []
+        for number, row in rows:
+            email = _text(row, "email")
+            if email in existing:
+                continue
+            existing.add(email)
+            user_values = _values(number, User, row, USER_FIELDS)
+            user = User(
+                username=email,
+                email=email,
+                role=User.Role.CANDIDATE,
+                password=self.get_password(number, row),
+                **user_values,
+            )
+            _validate(number, user, ["username", "email", *user_values])
+            citizenship = _text(row, "citizenship")
+            if citizenship and citizenship not in self.countries:
+                raise CommandError(f"Row {number}: unknown country {citizenship!r}")
+            profile_values = _values(number, TraineeProfile, row, PROFILE_FIELDS)
+            profile = TraineeProfile(
+                citizenship_id=self.countries.get(citizenship), **profile_values
+            )
+            _validate(number, profile, profile_values)
+            users.append(user)
+            profiles.append(profile)
+
+        User.objects.bulk_create(users)
+        for user, profile in zip(users, profiles):
+            profile.user = user
+        TraineeProfile.objects.bulk_create(profiles)
+        return users
+
+    def create_related(self, model, field_names, rows, profile_ids):
+        objects = []
+        for number, row in rows:
+            email = _text(row, "email")
+            if email not in profile_ids:
+                raise CommandError(f"Row {number}: unknown candidate {email!r}")
+            values = _values(number, model, row, field_names)
+            obj = model(profile_id=profile_ids[email], **values)
+            _validate(number, obj, values)
+            objects.append(obj)
+        model.objects.bulk_create(objects)
+
+    def get_password(self, number, row):
+        password = _text(row, "password")
+        if not password:
+            return make_password(None)
+        try:
+            identify_hasher(password)
+        except ValueError:
+            raise CommandError(
+                f"Row {number}: password must be a hash, not a raw value"
+            )
+        return password
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:41
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0013_user_token_version"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="traineeprofile",
+            index=models.Index(
+                models.OrderBy(
+                    django.db.models.expressions.CombinedExpression(
+                        models.F("cv_score"), "+", models.F("test_score")
+                    ),
+                    descending=True,
+                ),
+                models.OrderBy(models.F("user_id"), descending=True),
+                condition=models.Q(("test_status", "PASSED")),
+                name="trainee_profile_rating_idx",
+            ),
+        ),
+    ]
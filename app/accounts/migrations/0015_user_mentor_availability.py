@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:55
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_mentor_availability(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    Vacancy = apps.get_model("internship", "Vacancy")
+    WorkPlace = apps.get_model("internship", "WorkPlace")
+
+    def count(queryset):
+        return Coalesce(
+            Subquery(
+                queryset.filter(mentor_id=OuterRef("pk"))
+                .values("mentor_id")
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0,
+        )
+
+    User.objects.filter(role="M").update(
+        open_vacancy_count=count(Vacancy.objects.exclude(status="closed")),
+        active_work_place_count=count(WorkPlace.objects.filter(is_active=True)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0014_trainee_profile_rating_idx"),
+        ("internship", "0017_vacancy_response_applicant_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="active_work_place_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="open_vacancy_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(
+                    ("active_work_place_count", 0),
+                    ("open_vacancy_count", 0),
+                    ("role", "M"),
+                ),
+                fields=["department"],
+                name="free_mentor_idx",
+            ),
+        ),
+        migrations.RunPython(count_mentor_availability, migrations.RunPython.noop),
+    ]
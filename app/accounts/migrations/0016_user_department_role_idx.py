@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0015_user_mentor_availability"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["department", "role"], name="user_department_role_idx"
+            ),
+        ),
+    ]
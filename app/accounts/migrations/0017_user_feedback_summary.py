@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:03
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def count_feedback_summary(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    FeedBack = apps.get_model("internship", "FeedBack")
+
+    feedbacks = FeedBack.objects.filter(to_user_id=OuterRef("pk")).values("to_user_id")
+    User.objects.filter(pk__in=FeedBack.objects.values("to_user_id")).update(
+        feedback_count=Coalesce(
+            Subquery(feedbacks.annotate(count=Count("id")).values("count")), 0
+        ),
+        feedback_rating_sum=Coalesce(
+            Subquery(feedbacks.annotate(sum=Sum("rating")).values("sum")), 0
+        ),
+        last_feedback_date=Subquery(
+            FeedBack.objects.filter(to_user_id=OuterRef("pk"))
+            .order_by("-date")
+            .values("date")[:1]
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0016_user_department_role_idx"),
+        ("internship", "0025_feedback_to_user_date_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="feedback_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="feedback_rating_sum",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="last_feedback_date",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(count_feedback_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0017_user_feedback_summary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportProgress",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        max_length=255, unique=True, verbose_name="Source"
+                    ),
+                ),
+                (
+                    "rows",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Imported rows"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Import Progress",
+                "db_table": "accounts_import_progress",
+            },
+        ),
+    ]
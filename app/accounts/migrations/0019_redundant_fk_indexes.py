@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:32
+
+# user_department_role_idx starts with department_id and serves the same
+# lookups, so the single column index is redundant
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0018_import_progress"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="department",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="accounts.department",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:18
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0019_redundant_fk_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="education",
+            options={"ordering": ["id"], "verbose_name_plural": "Educations"},
+        ),
+        migrations.AlterModelOptions(
+            name="link",
+            options={"ordering": ["id"]},
+        ),
+        migrations.AlterModelOptions(
+            name="workexperience",
+            options={"ordering": ["id"], "verbose_name_plural": "Work Experiences"},
+        ),
+    ]
@@ -1,8 +1,10 @@
+from django.conf import settings
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
+from django.core.cache import cache
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models, transaction
-from django.db.models import F
+from django.db.models import F, Q
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
@@ -44,8 +46,34 @@ class UserManager(BaseUserManager):
             raise ValueError("Superuser must have is_superuser=True.")
         return self._create_user(username, password, **extra_fields)
 
+    def get_token_version(self, user_id):
+        key = User.token_version_cache_key(user_id)
+        version = cache.get(key)
+        if version is None:
+            version = (
+                self.filter(id=user_id).values_list("token_version", flat=True).first()
+            )
+            if version is not None:
+                cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+        return version
+
+    def forget_token_versions(self, user_ids):
+        cache.delete_many([User.token_version_cache_key(pk) for pk in user_ids])
+
 
 class User(AbstractUser):
+    # Fields copied into JWT claims, changing any of them invalidates issued tokens
+    TOKEN_CLAIM_FIELDS = ("role", "department_id", "is_active")
+    # Fields updated in the database by signals only, saving an instance loaded
+    # earlier must not write their stale values back
+    COUNTER_FIELDS = (
+        "open_vacancy_count",
+        "active_work_place_count",
+        "feedback_count",
+        "feedback_rating_sum",
+        "last_feedback_date",
+    )
+
     class Role(models.TextChoices):
         CANDIDATE = "F", _("Candidate")  # F - like first-timer
         TRAINEE = "T", _("Trainee")
@@ -58,18 +86,106 @@ class User(AbstractUser):
         max_length=1,
         choices=Role.choices,
     )
+    # Served by user_department_role_idx, which starts with the department
     department = models.ForeignKey(
-        Department, on_delete=models.CASCADE, blank=True, null=True
+        Department, on_delete=models.CASCADE, blank=True, null=True, db_index=False
     )
+    token_version = models.PositiveIntegerField(default=0)
+    # Mentor availability, maintained by internship on vacancy and work place changes
+    open_vacancy_count = models.PositiveIntegerField(default=0)
+    active_work_place_count = models.PositiveIntegerField(default=0)
+    # Summary of received feedbacks, maintained by internship on feedback changes
+    feedback_count = models.PositiveIntegerField(default=0)
+    feedback_rating_sum = models.PositiveIntegerField(default=0)
+    last_feedback_date = models.DateField(blank=True, null=True)
 
     objects = UserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(
+                fields=["department", "role"], name="user_department_role_idx"
+            ),
+            models.Index(
+                fields=["department"],
+                name="free_mentor_idx",
+                condition=Q(role="M", open_vacancy_count=0, active_work_place_count=0),
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._token_claims = instance._get_token_claims()
+        return instance
+
+    @property
+    def feedback_rating_average(self):
+        if self.feedback_count:
+            return round(self.feedback_rating_sum / self.feedback_count, 2)
+
+    @staticmethod
+    def token_version_cache_key(user_id):
+        return f"accounts:user:{user_id}:token_version"
+
+    def _get_token_claims(self):
+        return {
+            field: self.__dict__[field]
+            for field in self.TOKEN_CLAIM_FIELDS
+            if field in self.__dict__
+        }
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.name not in self.COUNTER_FIELDS
+            ]
+        loaded_claims = getattr(self, "_token_claims", None)
+        claims_changed = loaded_claims is not None and any(
+            self.__dict__.get(field, value) != value
+            for field, value in loaded_claims.items()
+        )
+        if claims_changed:
+            self.token_version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
+        super().save(*args, **kwargs)
+        self._token_claims = self._get_token_claims()
+        if claims_changed:
+            # Forgetting before the commit lets a concurrent token check cache
+            # the old version again
+            user_ids = [self.pk]
+            transaction.on_commit(
+                lambda: User.objects.forget_token_versions(user_ids),
+                using=self._state.db,
+            )
+
+    def delete(self, *args, **kwargs):
+        user_id = self.pk
+        using = self._state.db
+        result = super().delete(*args, **kwargs)
+        transaction.on_commit(
+            lambda: User.objects.forget_token_versions([user_id]), using=using
+        )
+        return result
+
+    @cached_property
+    def current_work_place_id(self):
+        # Work places are defined in the internship app, which imports this one
+        return self.work_on.model.objects.get_current_id(self.id, self.role)
+
     @cached_property
     def current_work_place(self):
-        if self.role == User.Role.TRAINEE:
-            return self.work_on.filter(is_active=True).first()
-        elif self.role == User.Role.MENTOR:
-            return self.mentor_on.filter(is_active=True).first()
+        if self.current_work_place_id is not None:
+            return self.work_on.model.objects.filter(
+                pk=self.current_work_place_id
+            ).first()
 
 
 class Country(models.Model):
@@ -87,7 +203,7 @@ class TraineeProfileManager(models.Manager):
         return (
             self.filter(test_status=TraineeProfile.QualifyingStatus.PASSED)
             .annotate(total_score=F("cv_score") + F("test_score"))
-            .order_by("-total_score")
+            .order_by("-total_score", "-user_id")
         )
 
 
@@ -157,6 +273,15 @@ class TraineeProfile(models.Model):
     class Meta:
         db_table = "accounts_trainee_profile"
         verbose_name_plural = "Trainee Profiles"
+        indexes = [
+            # Serves TraineeProfileManager.get_rating ordering and keyset pages
+            models.Index(
+                (F("cv_score") + F("test_score")).desc(),
+                F("user_id").desc(),
+                name="trainee_profile_rating_idx",
+                condition=Q(test_status="PASSED"),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.first_name} {self.user.last_name}"
@@ -171,6 +296,10 @@ class Link(models.Model):
     )
     url = models.URLField(verbose_name="URL")
 
+    class Meta:
+        # Profile collections are read in the order they were submitted
+        ordering = ["id"]
+
 
 class Education(models.Model):
     class Type(models.TextChoices):
@@ -205,6 +334,7 @@ class Education(models.Model):
         return self.name
 
     class Meta:
+        ordering = ["id"]
         verbose_name_plural = "Educations"
 
 
@@ -226,4 +356,19 @@ class WorkExperience(models.Model):
 
     class Meta:
         db_table = "accounts_work_experience"
+        ordering = ["id"]
         verbose_name_plural = "Work Experiences"
+
+
+class ImportProgress(models.Model):
+    # Saved in the same transaction as the imported rows, so a resumed import
+    # never replays rows that are already committed. Deleted once it finishes
+    source = models.CharField(max_length=255, unique=True, verbose_name="Source")
+    rows = models.PositiveIntegerField(default=0, verbose_name="Imported rows")
+
+    def __str__(self):
+        return self.source
+
+    class Meta:
+        db_table = "accounts_import_progress"
+        verbose_name_plural = "Import Progress"
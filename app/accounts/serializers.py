@@ -1,3 +1,4 @@
+from accounts.authentication import add_user_claims
 from accounts.models import (
     Country,
     Department,
@@ -158,30 +159,42 @@ class TraineeProfileSerializer(serializers.ModelSerializer):
             ]
             for field in ignore_fields:
                 validated_data.pop(field, None)
-        links_data = validated_data.pop("links", [])
-        educations_data = validated_data.pop("educations", [])
-        work_experiences_data = validated_data.pop("work_experiences", [])
-
-        instance.links.all().delete()
-        links = [Link(profile=instance, **link_data) for link_data in links_data]
-        Link.objects.bulk_create(links)
-
-        instance.educations.all().delete()
-        educations = [
-            Education(profile=instance, **education_data)
-            for education_data in educations_data
-        ]
-        Education.objects.bulk_create(educations)
-
-        instance.work_experiences.all().delete()
-        work_experiences = [
-            WorkExperience(profile=instance, **work_experience_data)
-            for work_experience_data in work_experiences_data
-        ]
-        WorkExperience.objects.bulk_create(work_experiences)
+        for related_name in ("links", "educations", "work_experiences"):
+            # Collections missing in the request are left as they are
+            if related_name in validated_data:
+                self.update_collection(
+                    instance, related_name, validated_data.pop(related_name)
+                )
 
         return super().update(instance, validated_data)
 
+    def update_collection(self, instance, related_name, items):
+        """
+        Makes rows of the collection match `items` touching only what changed.
+        Rows are matched with items by position in the id order the collection
+        is read in: equal rows are kept, changed ones are updated in place,
+        the rest are inserted or deleted
+        """
+        manager = getattr(instance, related_name)
+        fields = self.fields[related_name].child.Meta.fields
+
+        def values(obj):
+            return tuple(getattr(obj, field) for field in fields)
+
+        rows = sorted(manager.all(), key=lambda row: row.pk)
+        objects = [manager.model(profile=instance, **item) for item in items]
+        changed = []
+        for obj, row in zip(objects, rows):
+            if values(obj) != values(row):
+                obj.pk = row.pk
+                changed.append(obj)
+
+        manager.model.objects.bulk_update(changed, fields)
+        manager.model.objects.bulk_create(objects[len(rows) :])
+        manager.model.objects.filter(
+            pk__in=[row.pk for row in rows[len(objects) :]]
+        ).delete()
+
 
 class RatingTraineeProfileSerializer(serializers.ModelSerializer):
     first_name = serializers.CharField(source="user.first_name", read_only=True)
@@ -229,6 +242,22 @@ class DepartmentSerializer(serializers.ModelSerializer):
 
 
 class TokenObtainPairWithUserIdSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+    @classmethod
+    def get_token_data(cls, user):
+        """
+        Token pair for an already authenticated user, e.g. right after sign-up
+        """
+        refresh = cls.get_token(user)
+        return {
+            "refresh": str(refresh),
+            "access": str(refresh.access_token),
+            "user": UserSerializer(user).data,
+        }
+
     def validate(self, attrs):
         data = super().validate(attrs)
         data["user"] = UserSerializer(self.user).data
@@ -246,6 +275,21 @@ class SignUpSerializer(serializers.ModelSerializer):
         return User.objects.create_user(**validated_data)
 
 
+class FeedbackSummarySerializer(serializers.ModelSerializer):
+    user = serializers.IntegerField(source="id", read_only=True)
+    count = serializers.IntegerField(source="feedback_count")
+    rating_sum = serializers.IntegerField(source="feedback_rating_sum")
+    average_rating = serializers.FloatField(
+        source="feedback_rating_average", allow_null=True
+    )
+    last_date = serializers.DateField(source="last_feedback_date")
+
+    class Meta:
+        model = User
+        fields = ("user", "count", "rating_sum", "average_rating", "last_date")
+        read_only_fields = fields
+
+
 class UserSerializer(serializers.ModelSerializer):
     department = DepartmentSerializer(required=False)
 
@@ -253,6 +297,18 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ("id", "email", "role", "first_name", "last_name", "department")
 
+    def get_fields(self):
+        # `?with_feedback_summary=true` adds the summary stored on the user row
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if request is not None and request.query_params.get(
+            "with_feedback_summary"
+        ) in ("1", "true"):
+            fields["feedback_summary"] = FeedbackSummarySerializer(
+                source="*", read_only=True
+            )
+        return fields
+
 
 class TokenObtainPairResponseSerializer(serializers.Serializer):
     access = serializers.CharField()
@@ -1,4 +1,7 @@
 import pytest
+from accounts.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
@@ -34,3 +37,62 @@ def test_refresh_token(generic_api_client):
 
     # Проверка наличия обновленного access-токена в ответе
     assert "access" in response.data
+
+
+def _sign_in(client, username):
+    url = reverse("token_obtain_pair")
+    data = {"username": username, "password": "password"}
+    response = client.post(url, data, format="json")
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+
+@pytest.mark.django_db
+def test_token_authentication_does_not_load_user(anon_api_client, curator):
+    _sign_in(anon_api_client, "curator@user.com")
+    url = reverse("users-free-mentors")
+    anon_api_client.get(url)  # warm up token version cache
+
+    with CaptureQueriesContext(connection) as context:
+        response = anon_api_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(context.captured_queries) == 1  # only the list of mentors
+
+
+@pytest.mark.django_db
+def test_token_authentication_after_role_change(
+    anon_api_client, candidate, django_capture_on_commit_callbacks
+):
+    _sign_in(anon_api_client, "user@user.com")
+    url = reverse("users-list")
+    response = anon_api_client.get(url)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    with django_capture_on_commit_callbacks(execute=True):
+        candidate.role = User.Role.CURATOR
+        candidate.save()
+
+    response = anon_api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_token_authentication_inactive_user(
+    anon_api_client, curator, django_capture_on_commit_callbacks
+):
+    _sign_in(anon_api_client, "curator@user.com")
+    url = reverse("users-list")
+    response = anon_api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        curator.is_active = False
+        curator.save()
+        # The cached version is kept until the change is committed
+        response = anon_api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+    for callback in callbacks:
+        callback()
+
+    response = anon_api_client.get(url)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -29,3 +29,22 @@ def test_retrieve_country(generic_api_client, preferable_country):
     response_data = response.json()
     assert response_data["id"] == preferable_country.id
     assert response_data["name"] == preferable_country.name
+
+
+@pytest.mark.django_db
+def test_list_countries_paginated_on_request(
+    generic_api_client, preferable_country, non_preferable_country
+):
+    url = reverse("countries-list")
+
+    response = generic_api_client.get(url, {"limit": 1})
+    assert response.status_code == 200
+    assert [country["id"] for country in response.data["results"]] == [
+        preferable_country.id
+    ]
+
+    response = generic_api_client.get(response.data["next"])
+    assert [country["id"] for country in response.data["results"]] == [
+        non_preferable_country.id
+    ]
+    assert response.data["next"] is None
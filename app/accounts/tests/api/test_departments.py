@@ -1,4 +1,5 @@
 import pytest
+from accounts.models import Department
 from django.urls import reverse
 
 
@@ -29,3 +30,49 @@ def test_retrieve_department(generic_api_client, department):
     response_data = response.json()
     assert response_data["id"] == department.id
     assert response_data["name"] == department.name
+
+
+@pytest.mark.django_db
+def test_list_departments_cached(
+    generic_api_client, department, django_assert_num_queries
+):
+    url = reverse("departments-list")
+    generic_api_client.get(url)
+
+    with django_assert_num_queries(0):
+        response = generic_api_client.get(url)
+    assert len(response.json()) == 2
+
+
+@pytest.mark.django_db
+def test_list_departments_invalidated_on_change(
+    generic_api_client, department, django_capture_on_commit_callbacks
+):
+    url = reverse("departments-list")
+    generic_api_client.get(url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        department.name = "Renamed department"
+        department.save()
+        Department.objects.create(name="Department 3")
+
+    response = generic_api_client.get(url)
+    department_names = [dep["name"] for dep in response.json()]
+    assert len(department_names) == 3
+    assert "Renamed department" in department_names
+
+
+@pytest.mark.django_db
+def test_list_departments_invalidated_after_commit(
+    generic_api_client, department, django_capture_on_commit_callbacks
+):
+    url = reverse("departments-list")
+    generic_api_client.get(url)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        Department.objects.create(name="Department 3")
+    assert len(generic_api_client.get(url).json()) == 2
+
+    for callback in callbacks:
+        callback()
+    assert len(generic_api_client.get(url).json()) == 3
@@ -1,5 +1,8 @@
+from unittest import mock
+
 import pytest
 from accounts.models import User
+from django.contrib.auth.hashers import get_hasher
 from django.urls import reverse
 from rest_framework import status
 
@@ -50,3 +53,25 @@ def test_registration_existing_user(generic_api_client):
     assert response.json() == {
         "username": ["A user with that username already exists."]
     }
+
+
+@pytest.mark.django_db
+def test_registration_hashes_password_once(anon_api_client):
+    url = reverse("sign-up")
+    data = {
+        "username": "testuser@us.com",
+        "password": "testpassword",
+        "first_name": "Test",
+        "last_name": "User",
+    }
+    hasher = get_hasher()
+
+    with mock.patch.object(type(hasher), "encode", wraps=hasher.encode) as encode:
+        response = anon_api_client.post(url, data, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert encode.call_count == 1
+    assert response.data["user"]["email"] == "testuser@us.com"
+    anon_api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+    response = anon_api_client.get(reverse("users-list"))
+    assert response.status_code == status.HTTP_403_FORBIDDEN  # candidate
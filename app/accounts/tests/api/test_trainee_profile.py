@@ -1,5 +1,8 @@
 import pytest
-from accounts.models import TraineeProfile, User
+from accounts.models import Education, Link, TraineeProfile, User
+from backend.pagination import Row
+from django.db.models import F, Value
+from django.db.models.lookups import LessThan
 from django.urls import reverse
 
 
@@ -217,3 +220,172 @@ def test_rating_list_trainee_profiles_sort(
     results = response_data["results"]
     assert len(results) == 2
     assert results[0]["total_score"] > results[1]["total_score"]
+
+
+@pytest.fixture
+def rated_profiles(create_user):
+    scores = [(50, 50), (40, 40), (40, 40), (40, 40), (10, 0)]
+    profiles = []
+    for i, (cv_score, test_score) in enumerate(scores):
+        profile = create_user(username=f"rated{i}@user.com").trainee_profile
+        profile.cv_score = cv_score
+        profile.test_score = test_score
+        profile.test_status = TraineeProfile.QualifyingStatus.PASSED
+        profile.save()
+        profiles.append(profile)
+    return profiles
+
+
+@pytest.mark.django_db
+def test_rating_keyset_pagination(curator_client, rated_profiles):
+    expected = [
+        profile.user_id
+        for profile in sorted(
+            rated_profiles,
+            key=lambda p: (p.cv_score + p.test_score, p.user_id),
+            reverse=True,
+        )
+    ]
+
+    pages = []
+    url = reverse("trainee-profiles-rating") + "?limit=2"
+    while url:
+        response = curator_client.get(url)
+        assert response.status_code == 200
+        pages.append([data["user_id"] for data in response.data["results"]])
+        url = response.data["next"]
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert sum(pages, []) == expected
+
+    response = curator_client.get(response.data["previous"])
+    assert [data["user_id"] for data in response.data["results"]] == pages[1]
+    response = curator_client.get(response.data["previous"])
+    assert [data["user_id"] for data in response.data["results"]] == pages[0]
+    assert response.data["previous"] is None
+
+
+@pytest.mark.django_db
+def test_rating_page_uses_index(query_plan, rated_profiles):
+    page = TraineeProfile.objects.get_rating().filter(
+        LessThan(Row(F("total_score"), F("user_id")), Row(Value(80), Value(0)))
+    )[:10]
+    plan = query_plan(page)
+    assert "Index Scan using trainee_profile_rating_idx" in plan
+    assert "Sort" not in plan
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("count", [10, 100])
+def test_list_trainee_profiles_num_queries(
+    anon_api_client, create_filled_profiles, assert_list_num_queries, count
+):
+    url = reverse("trainee-profiles-list")
+
+    # count, profiles with users and citizenship, links, educations, work experiences
+    results = assert_list_num_queries(
+        anon_api_client, url, create_filled_profiles, count, num_queries=5
+    )
+    assert all(len(data["links"]) == 1 for data in results)
+    assert all(data["citizenship"]["id"] for data in results)
+
+
+@pytest.mark.django_db
+def test_retrieve_trainee_profile_num_queries(
+    anon_api_client, create_filled_profiles, django_assert_num_queries
+):
+    create_filled_profiles(1)
+    profile = TraineeProfile.objects.get()
+    url = reverse("trainee-profiles-detail", kwargs={"user_id": profile.user_id})
+
+    with django_assert_num_queries(4):
+        response = anon_api_client.get(url)
+    assert response.data["email"] == profile.user.email
+
+
+@pytest.fixture
+def profile_with_educations(trainee_profile):
+    for name in ("University A", "University B"):
+        Education.objects.create(
+            profile=trainee_profile,
+            name=name,
+            type=Education.Type.UNIVERSITY,
+            start_year=2018,
+            specialization="CS",
+        )
+    Link.objects.create(profile=trainee_profile, url="https://example.com")
+    return trainee_profile
+
+
+def _education_data(name):
+    return {
+        "name": name,
+        "type": "university",
+        "start_year": 2018,
+        "specialization": "CS",
+    }
+
+
+@pytest.mark.django_db
+def test_partial_update_keeps_omitted_collections(api_client, profile_with_educations):
+    url = reverse(
+        "trainee-profiles-detail", kwargs={"user_id": profile_with_educations.user_id}
+    )
+    education_ids = set(profile_with_educations.educations.values_list("id", flat=True))
+    link_ids = set(profile_with_educations.links.values_list("id", flat=True))
+
+    response = api_client.patch(url, {"bio": "New bio"}, format="json")
+
+    assert response.status_code == 200
+    assert len(response.data["educations"]) == 2
+    assert set(Education.objects.values_list("id", flat=True)) == education_ids
+    assert set(Link.objects.values_list("id", flat=True)) == link_ids
+
+
+@pytest.mark.django_db
+def test_partial_update_diffs_collections(api_client, profile_with_educations):
+    url = reverse(
+        "trainee-profiles-detail", kwargs={"user_id": profile_with_educations.user_id}
+    )
+    education_a, education_b = profile_with_educations.educations.order_by("id")
+    link = profile_with_educations.links.get()
+    data = {
+        "educations": [
+            _education_data("University A"),
+            _education_data("University C"),
+            _education_data("University D"),
+        ],
+        "links": [{"url": link.url}],
+    }
+
+    response = api_client.patch(url, data, format="json")
+
+    assert response.status_code == 200
+    educations = list(Education.objects.order_by("id"))
+    assert [education.name for education in educations] == [
+        "University A",
+        "University C",
+        "University D",
+    ]
+    assert educations[0].id == education_a.id  # untouched
+    assert educations[1].id == education_b.id  # updated in place
+    assert Link.objects.get().id == link.id
+
+    data = {
+        "educations": [
+            _education_data("University D"),
+            _education_data("University A"),
+            _education_data("University C"),
+        ]
+    }
+    response = api_client.patch(url, data, format="json")
+
+    assert response.status_code == 200
+    names = ["University D", "University A", "University C"]
+    assert [education["name"] for education in response.data["educations"]] == names
+    response = api_client.get(url)
+    assert [education["name"] for education in response.data["educations"]] == names
+
+    response = api_client.patch(url, {"educations": []}, format="json")
+
+    assert response.status_code == 200
+    assert not Education.objects.exists()
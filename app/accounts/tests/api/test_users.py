@@ -1,7 +1,8 @@
 import pytest
 from accounts.models import User
+from accounts.views import UserViewSet
 from django.urls import reverse
-from internship.models import Vacancy
+from internship.models import Vacancy, VacancyResponse, WorkPlace
 from rest_framework import status
 
 
@@ -48,6 +49,62 @@ def test_get_list_of_users_mentor(mentor_client, trainee, vacancy_response):
     assert len(response.data) == 1
 
 
+@pytest.fixture
+def second_vacancy_response(published_vacancy, trainee_profile):
+    vacancy = Vacancy.objects.get(pk=published_vacancy.pk)
+    vacancy.pk = None
+    vacancy.save()
+    return VacancyResponse.objects.create(
+        vacancy=vacancy, applicant=trainee_profile, text_answer="Answer"
+    )
+
+
+@pytest.mark.django_db
+def test_get_list_of_users_mentor_without_duplicates(
+    mentor_client, trainee, vacancy_response, second_vacancy_response
+):
+    url = reverse("users-list")
+    response = mentor_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [user["id"] for user in response.data] == [trainee.id]
+
+
+@pytest.mark.django_db
+def test_get_list_of_users_personnel_without_duplicates(
+    personnel_client,
+    personnel,
+    mentor,
+    trainee,
+    vacancy_response,
+    second_vacancy_response,
+):
+    url = reverse("users-list")
+    response = personnel_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(user["id"] for user in response.data) == sorted(
+        [personnel.id, mentor.id, trainee.id]
+    )
+
+
+@pytest.mark.django_db
+def test_get_list_of_users_paginated(
+    curator_client, trainee, candidate, mentor, personnel
+):
+    url = reverse("users-list")
+    ids = []
+    params = {"limit": 2}
+    while url:
+        response = curator_client.get(url, params)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) <= 2
+        ids += [user["id"] for user in response.data["results"]]
+        url, params = response.data["next"], None
+
+    assert ids == sorted(User.objects.values_list("id", flat=True))
+
+
 @pytest.mark.django_db
 def test_get_list_of_users_curator(
     curator_client, trainee, candidate, mentor, personnel
@@ -106,3 +163,97 @@ def test_get_free_mentors_closed_vacancy(personnel_client, mentor, published_vac
     response = personnel_client.get(url)
     assert response.status_code == status.HTTP_200_OK
     assert len(response.data) == 1
+
+
+@pytest.mark.django_db
+def test_get_free_mentors_closed_and_open_vacancy(
+    personnel_client, mentor, published_vacancy
+):
+    closed_vacancy = Vacancy.objects.get(pk=published_vacancy.pk)
+    closed_vacancy.pk = None
+    closed_vacancy.status = Vacancy.Status.CLOSED
+    closed_vacancy.save()
+
+    url = reverse("users-free-mentors")
+    response = personnel_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data) == 0
+
+
+@pytest.mark.django_db
+def test_get_free_mentors_active_work_place(
+    personnel_client, mentor, trainee, department
+):
+    work_place = WorkPlace.objects.create(
+        name="Work place", trainee=trainee, mentor=mentor, department=department
+    )
+    url = reverse("users-free-mentors")
+    response = personnel_client.get(url)
+    assert len(response.data) == 0
+
+    work_place = WorkPlace.objects.get(pk=work_place.pk)
+    work_place.is_active = False
+    work_place.save()
+    response = personnel_client.get(url)
+    assert len(response.data) == 1
+
+
+@pytest.mark.django_db
+def test_get_free_mentors_mentor_changed(
+    personnel_client, mentor, published_vacancy, create_user, department
+):
+    other_mentor = create_user(
+        role=User.Role.MENTOR, username="mentor2@user.com", department=department
+    )
+    vacancy = Vacancy.objects.get(pk=published_vacancy.pk)
+    vacancy.mentor = other_mentor
+    vacancy.save()
+
+    url = reverse("users-free-mentors")
+    response = personnel_client.get(url)
+    assert [user["id"] for user in response.data] == [mentor.id]
+
+    vacancy.delete()
+    response = personnel_client.get(url)
+    assert len(response.data) == 2
+
+
+@pytest.mark.django_db
+def test_user_save_keeps_counters(mentor, published_vacancy):
+    mentor.first_name = "Jane"  # loaded before the vacancy was counted
+    mentor.save()
+
+    mentor = User.objects.get(pk=mentor.pk)
+    assert mentor.first_name == "Jane"
+    assert mentor.open_vacancy_count == 1
+
+
+@pytest.mark.django_db
+def test_free_mentors_use_index(query_plan, mentor, department):
+    free_mentors = User.objects.filter(
+        role=User.Role.MENTOR,
+        open_vacancy_count=0,
+        active_work_place_count=0,
+        department=department,
+    )
+    assert "free_mentor_idx" in query_plan(free_mentors)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "role,index",
+    [
+        ("personnel", "user_department_role_idx"),
+        ("mentor", "vacancy_mentor_status_idx"),
+    ],
+)
+def test_users_scope_uses_indexes(
+    request, query_plan, vacancy_response, create_other_vacancy_responses, role, index
+):
+    user = request.getfixturevalue(role)
+    create_other_vacancy_responses(500)
+    queryset = UserViewSet(action="list").scope_queryset(User.objects.all(), user)
+    plan = query_plan(queryset)
+    assert index in plan
+    assert "Seq Scan" not in plan
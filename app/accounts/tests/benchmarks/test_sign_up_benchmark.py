@@ -0,0 +1,49 @@
+import time
+
+import pytest
+from accounts.serializers import SignUpSerializer, TokenObtainPairWithUserIdSerializer
+from django.urls import reverse
+from rest_framework import status
+
+SIGN_UPS = 20
+
+
+def _sign_up_data(prefix, i):
+    return {
+        "username": f"{prefix}{i}@user.com",
+        "password": "password",
+        "first_name": "John",
+        "last_name": "Doe",
+    }
+
+
+def _re_authenticating_sign_up(data):
+    # Sign-up flow before tokens were minted for the created user directly
+    serializer = SignUpSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    response_serializer = TokenObtainPairWithUserIdSerializer(
+        data={"username": data["username"], "password": data["password"]}
+    )
+    response_serializer.is_valid(raise_exception=True)
+    return response_serializer.validated_data
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_sign_up_throughput(anon_api_client):
+    url = reverse("sign-up")
+
+    start = time.perf_counter()
+    for i in range(SIGN_UPS):
+        _re_authenticating_sign_up(_sign_up_data("before", i))
+    before = SIGN_UPS / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(SIGN_UPS):
+        response = anon_api_client.post(url, _sign_up_data("after", i), format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+    after = SIGN_UPS / (time.perf_counter() - start)
+
+    print(f"\nSign-ups per second per worker: before {before:.1f}, after {after:.1f}")
+    assert after > before * 1.5
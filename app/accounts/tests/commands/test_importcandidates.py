@@ -0,0 +1,194 @@
+import csv
+
+import pytest
+from accounts.models import (
+    Education,
+    ImportProgress,
+    TraineeProfile,
+    User,
+    WorkExperience,
+)
+from django.contrib.auth.hashers import make_password
+from django.core.management import CommandError, call_command
+from openpyxl import Workbook
+
+HEADER = [
+    "record",
+    "email",
+    "first_name",
+    "last_name",
+    "citizenship",
+    "birth_date",
+    "password",
+    "name",
+    "type",
+    "start_year",
+    "specialization",
+    "employer",
+    "position",
+    "start_date",
+]
+
+
+def _candidate(email, citizenship="", password=""):
+    return {
+        "record": "candidate",
+        "email": email,
+        "first_name": "John",
+        "last_name": "Doe",
+        "citizenship": citizenship,
+        "birth_date": "2000-01-01",
+        "password": password,
+    }
+
+
+def _education(email):
+    return {
+        "record": "education",
+        "email": email,
+        "name": "University",
+        "type": "university",
+        "start_year": "2018",
+        "specialization": "CS",
+    }
+
+
+def _work_experience(email):
+    return {
+        "record": "work_experience",
+        "email": email,
+        "employer": "Company",
+        "position": "Developer",
+        "start_date": "2021-01-01",
+    }
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=HEADER)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+@pytest.mark.django_db
+def test_import_candidates(tmp_path, preferable_country):
+    password = make_password("secret")
+    path = _write_csv(
+        tmp_path / "candidates.csv",
+        [
+            _candidate("first@user.com", preferable_country.name, password),
+            _education("first@user.com"),
+            _candidate("second@user.com"),
+            _work_experience("first@user.com"),
+            _work_experience("second@user.com"),
+        ],
+    )
+
+    call_command("importcandidates", path, batch_size=2)
+
+    assert User.objects.filter(role=User.Role.CANDIDATE).count() == 2
+    first = User.objects.get(username="first@user.com")
+    assert first.check_password("secret")
+    assert first.trainee_profile.citizenship == preferable_country
+    assert first.trainee_profile.educations.count() == 1
+    assert first.trainee_profile.work_experiences.count() == 1
+    second = User.objects.get(username="second@user.com")
+    assert not second.has_usable_password()
+    assert str(second.trainee_profile.birth_date) == "2000-01-01"
+    assert not ImportProgress.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_candidates_from_xlsx(tmp_path):
+    workbook = Workbook()
+    workbook.active.append(HEADER)
+    for row in [_candidate("first@user.com"), _education("first@user.com")]:
+        workbook.active.append([row.get(name) for name in HEADER])
+    workbook.save(tmp_path / "candidates.xlsx")
+
+    call_command("importcandidates", tmp_path / "candidates.xlsx")
+
+    assert TraineeProfile.objects.get().educations.count() == 1
+
+
+@pytest.mark.django_db
+def test_import_candidates_resumes_after_failure(tmp_path):
+    rows = [
+        _candidate("first@user.com"),
+        _education("first@user.com"),
+        _candidate("second@user.com", password="raw password"),
+        _education("second@user.com"),
+    ]
+    path = _write_csv(tmp_path / "candidates.csv", rows)
+
+    with pytest.raises(CommandError, match="Row 3"):
+        call_command("importcandidates", path, batch_size=2)
+    assert User.objects.count() == 1
+
+    assert ImportProgress.objects.get(source="candidates.csv").rows == 2
+    rows[2]["password"] = ""
+    _write_csv(path, rows)
+    with pytest.raises(CommandError, match="pass --resume"):
+        call_command("importcandidates", path, batch_size=2)
+    call_command("importcandidates", path, batch_size=2, resume=True)
+    with pytest.raises(CommandError, match="No interrupted import"):
+        call_command("importcandidates", path, batch_size=2, resume=True)
+
+    assert User.objects.count() == 2
+    assert Education.objects.count() == 2
+    assert WorkExperience.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_import_candidates_does_not_replay_committed_rows(tmp_path, monkeypatch):
+    rows = [
+        _candidate("first@user.com"),
+        _education("first@user.com"),
+        _work_experience("first@user.com"),
+        _education("first@user.com"),
+    ]
+    path = _write_csv(tmp_path / "candidates.csv", rows)
+    save = ImportProgress.save
+
+    def fail_second_batch(self, *args, **kwargs):
+        if self.rows > 2:
+            raise RuntimeError("Connection lost")
+        save(self, *args, **kwargs)
+
+    monkeypatch.setattr(ImportProgress, "save", fail_second_batch)
+    with pytest.raises(RuntimeError):
+        call_command("importcandidates", path, batch_size=2)
+    monkeypatch.setattr(ImportProgress, "save", save)
+    call_command("importcandidates", path, batch_size=2, resume=True)
+
+    assert Education.objects.count() == 2
+    assert WorkExperience.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_import_candidates_short_rows(tmp_path):
+    path = tmp_path / "candidates.csv"
+    path.write_text(
+        "record,email,first_name\ncandidate,first@user.com,John\neducation\n"
+    )
+
+    with pytest.raises(CommandError, match="Row 2: unknown candidate ''"):
+        call_command("importcandidates", path, batch_size=1)
+    assert User.objects.get().first_name == "John"
+
+
+@pytest.mark.django_db
+def test_import_candidates_new_file_with_same_name(tmp_path):
+    path = _write_csv(
+        tmp_path / "candidates.csv",
+        [_candidate("first@user.com"), _education("first@user.com")],
+    )
+    call_command("importcandidates", path)
+
+    _write_csv(path, [_candidate("second@user.com"), _education("second@user.com")])
+    call_command("importcandidates", path)
+
+    assert User.objects.count() == 2
+    second = User.objects.get(username="second@user.com")
+    assert second.trainee_profile.educations.count() == 1
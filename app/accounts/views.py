@@ -12,12 +12,14 @@ from accounts.serializers import (
     TraineeProfileSerializer,
     UserSerializer,
 )
-from django.db.models import Q
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from backend.cache import VersionedCacheMixin
+from backend.eager_loading import EagerLoadingMixin
+from backend.pagination import KeysetPagination, OptionalKeysetPagination
+from backend.scoping import ScopedQuerysetMixin, all_rows, user_lookups
+from django.db.models import Exists, OuterRef, Q
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
-from internship.models import Vacancy
+from internship.models import VacancyResponse
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -71,18 +73,27 @@ class SignUpAPIView(APIView):
     def post(self, request):
         serializer = SignUpSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        response_serializer = TokenObtainPairWithUserIdSerializer(
-            data={
-                "username": serializer.validated_data["username"],
-                "password": serializer.validated_data["password"],
-            }
+        user = serializer.save()
+        # The password has just been hashed, authenticating would hash it again
+        return Response(
+            TokenObtainPairWithUserIdSerializer.get_token_data(user), status=201
         )
-        response_serializer.is_valid()
-        return Response(response_serializer.validated_data, status=201)
+
+
+class RatingPagination(KeysetPagination):
+    ordering = ("-total_score", "-user_id")
+
+
+class UserPagination(OptionalKeysetPagination):
+    ordering = ("id",)
+
+
+class LookupPagination(OptionalKeysetPagination):
+    ordering = ("id",)
 
 
 class TraineeProfileViewSet(
+    EagerLoadingMixin,
     viewsets.GenericViewSet,
     viewsets.mixins.RetrieveModelMixin,
     viewsets.mixins.ListModelMixin,
@@ -113,20 +124,52 @@ class TraineeProfileViewSet(
             return TraineeProfile.objects.get_rating()
         return self.queryset
 
-    @action(detail=False, methods=["GET"])
+    @action(detail=False, methods=["GET"], pagination_class=RatingPagination)
     def rating(self, request):
         return self.list(request)
 
 
+def _department_scope(user):
+    # UNION instead of OR, so each half is served by its own index
+    return Q(
+        pk__in=User.objects.filter(department_id=user.department_id)
+        .values("id")
+        .union(
+            VacancyResponse.objects.filter(
+                vacancy__department_id=user.department_id
+            ).values("applicant_id")
+        )
+    )
+
+
+def _mentor_scope(user):
+    # EXISTS instead of joining responses, which returns a user per response
+    return Exists(
+        VacancyResponse.objects.filter(
+            applicant_id=OuterRef("pk"), vacancy__mentor_id=user.id
+        )
+    )
+
+
 class UserViewSet(
+    ScopedQuerysetMixin,
     viewsets.GenericViewSet,
     viewsets.mixins.ListModelMixin,
 ):
     queryset = User.objects.all()
     serializer_class = UserSerializer
-    pagination_class = None
+    pagination_class = UserPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["role", "department"]
+    scopes = {
+        User.Role.CURATOR: all_rows,
+        User.Role.PERSONNEL: _department_scope,
+        User.Role.MENTOR: _mentor_scope,
+    }
+    free_mentor_scopes = {
+        User.Role.CURATOR: all_rows,
+        User.Role.PERSONNEL: user_lookups(department_id="department_id"),
+    }
 
     def get_permissions(self):
         if self.action in ["update", "partial_update"]:
@@ -137,42 +180,33 @@ class UserViewSet(
             permission_classes = [IsAuthenticated, IsCurator | IsPersonnel | IsMentor]
         return [permission() for permission in permission_classes]
 
+    def get_scopes(self):
+        if self.action == "free_mentors":
+            return self.free_mentor_scopes
+        return self.scopes
+
     def get_queryset(self):
+        qs = super().get_queryset()
         if self.action == "free_mentors":
-            qs = self.queryset.filter(role=User.Role.MENTOR).filter(
-                Q(mentor_of__isnull=True) | Q(mentor_of__status=Vacancy.Status.CLOSED)
-            )
-            if self.request.user.role == User.Role.PERSONNEL:
-                qs = qs.filter(department=self.request.user.department)
-            return qs
-        if self.request.user.role == User.Role.PERSONNEL:
-            department = self.request.user.department
-            return self.queryset.filter(
-                Q(department=department)
-                | Q(trainee_profile__vacancyresponse__vacancy__department=department)
-            )
-        if self.request.user.role == User.Role.MENTOR:
-            return self.queryset.filter(
-                trainee_profile__vacancyresponse__vacancy__mentor=self.request.user
+            return qs.filter(
+                role=User.Role.MENTOR, open_vacancy_count=0, active_work_place_count=0
             )
-        return self.queryset
+        return qs
 
     @action(methods=["GET"], detail=False, url_path="free-mentors")
     def free_mentors(self, request):
         return self.list(request)
 
 
-class CountryViewSet(viewsets.ReadOnlyModelViewSet):
+class CountryViewSet(VersionedCacheMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
-    pagination_class = None
+    pagination_class = LookupPagination
+    cache_models = [Country]
 
 
-class DepartmentViewSet(ReadOnlyModelViewSet):
+class DepartmentViewSet(VersionedCacheMixin, ReadOnlyModelViewSet):
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
-    pagination_class = None
-
-    @method_decorator(cache_page(60 * 60 * 6))
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+    pagination_class = LookupPagination
+    cache_models = [Department]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attendance", "0002_report_work_place_alter_report_approved_by_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="report",
+            name="date",
+            field=models.DateField(),
+        ),
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(fields=["date", "id"], name="report_date_idx"),
+        ),
+    ]
@@ -11,7 +11,7 @@ class Report(models.Model):
         VACATION = "VACATION", _("Vacation")
         STUDY_VACATION = "STUDY_VACATION", _("Study vacation")
 
-    date = models.DateField(db_index=True)
+    date = models.DateField()
     applicant = models.ForeignKey(
         "accounts.User", on_delete=models.CASCADE, related_name="reports"
     )
@@ -31,6 +31,12 @@ class Report(models.Model):
         WorkPlace, on_delete=models.CASCADE, related_name="reports", null=True
     )
 
+    class Meta:
+        indexes = [
+            # Pages of the report list, see `ReportPagination`
+            models.Index(fields=["date", "id"], name="report_date_idx"),
+        ]
+
     @cached_property
     def report_status(self):
         if self.status == Report.StatusType.VACATION:
@@ -9,8 +9,10 @@ class ReportSerializer(serializers.ModelSerializer):
         read_only_fields = ("id", "applicant", "approved_by")
 
     def create(self, validated_data):
-        validated_data["applicant"] = self.context["request"].user
-        validated_data["work_place"] = self.context["request"].user.current_work_place
+        user = self.context["request"].user
+        validated_data["applicant"] = user
+        validated_data.pop("work_place", None)
+        validated_data["work_place_id"] = user.current_work_place_id
         return Report.objects.create(**validated_data)
 
     def update(self, instance, validated_data):
@@ -1,8 +1,10 @@
-from datetime import timedelta
+from datetime import date, timedelta
 
 import pytest
 from attendance.models import Report
+from attendance.views import ReportViewSet
 from django.urls import reverse
+from internship.models import WorkPlace
 
 
 @pytest.mark.django_db
@@ -21,6 +23,21 @@ def test_create_report(api_client, work_place, trainee, mentor):
     assert report.is_approved is False
 
 
+@pytest.mark.django_db
+def test_create_report_with_cached_work_place(
+    api_client, work_place, trainee, django_assert_num_queries
+):
+    WorkPlace.objects.get_current_id(trainee.id, trainee.role)
+    url = reverse("reports-list")
+
+    with django_assert_num_queries(1):
+        response = api_client.post(
+            url, data={"status": Report.StatusType.ATTENDED, "date": "2023-05-27"}
+        )
+    assert response.status_code == 201
+    assert Report.objects.get().work_place == work_place
+
+
 @pytest.mark.django_db
 def test_update_report(mentor_client, report, mentor):
     url = reverse("reports-detail", args=[report.id])
@@ -78,16 +95,16 @@ def test_get_reports(mentor_client, report, mentor):
     date_from = (report.date - timedelta(days=1)).strftime("%Y-%m-%d")
     response = mentor_client.get(url, {"date_from": date_from})
     assert response.status_code == 200
-    assert len(response.data) == 1
+    assert len(response.data["results"]) == 1
 
     date_from = (report.date + timedelta(days=1)).strftime("%Y-%m-%d")
     response = mentor_client.get(url, {"date_from": date_from})
     assert response.status_code == 200
-    assert len(response.data) == 0
+    assert len(response.data["results"]) == 0
 
     response = mentor_client.get(url, {"is_approved": True})
     assert response.status_code == 200
-    assert len(response.data) == 0
+    assert len(response.data["results"]) == 0
 
 
 @pytest.mark.django_db
@@ -103,3 +120,59 @@ def test_get_reports_for_trainee(api_client, report, mentor):
     assert actual_report.work_place == report.work_place
     assert actual_report.is_approved is False
     assert actual_report.approved_by is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "role,index",
+    [
+        ("personnel", "user_department_role_idx"),
+        ("mentor", "work_place_mentor_idx"),
+        ("trainee", "attendance_work_place_trainee_id"),
+    ],
+)
+def test_reports_scope_uses_indexes(
+    request, query_plan, create_other_work_places, role, index
+):
+    user = request.getfixturevalue(role)
+    Report.objects.bulk_create(
+        Report(
+            applicant_id=work_place.trainee_id,
+            work_place=work_place,
+            date=date(2023, 6, day),
+        )
+        for work_place in create_other_work_places(100)
+        for day in range(1, 6)
+    )
+    queryset = ReportViewSet(action="list").scope_queryset(Report.objects.all(), user)
+    plan = query_plan(queryset)
+    assert index in plan
+    assert "Seq Scan" not in plan
+
+
+@pytest.mark.django_db
+def test_get_reports_pages(mentor_client, report, trainee, work_place):
+    reports = [report] + [
+        Report.objects.create(
+            applicant=trainee,
+            work_place=work_place,
+            date=report.date - timedelta(days=i),
+        )
+        for i in range(1, 5)
+    ]
+    url = f"{reverse('reports-list')}?limit=2"
+
+    ids = []
+    while url:
+        response = mentor_client.get(url)
+        assert len(response.data["results"]) <= 2
+        ids += [data["id"] for data in response.data["results"]]
+        url = response.data["next"]
+    assert ids == [report.id for report in reports]
+
+
+@pytest.mark.django_db
+def test_reports_page_uses_index(query_plan, report):
+    queryset = Report.objects.order_by("-date", "-id")[:100]
+    plan = query_plan(queryset)
+    assert "report_date_idx" in plan
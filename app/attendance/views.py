@@ -6,6 +6,8 @@ from attendance.excel_exporter import form_report
 from attendance.filters import ReportFilterSet
 from attendance.models import Report
 from attendance.serializers import ReportSerializer
+from backend.pagination import KeysetPagination
+from backend.scoping import ScopedQuerysetMixin, all_rows, user_lookups
 from django.core.files import File
 from django.http import HttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
@@ -15,12 +17,24 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 
 
-class ReportViewSet(viewsets.ModelViewSet):
+class ReportPagination(KeysetPagination):
+    ordering = ("-date", "-id")
+
+
+class ReportViewSet(ScopedQuerysetMixin, viewsets.ModelViewSet):
     queryset = Report.objects.all()
     serializer_class = ReportSerializer
-    pagination_class = None
+    pagination_class = ReportPagination
     filter_backends = [DjangoFilterBackend]
     filterset_class = ReportFilterSet
+    scopes = {
+        User.Role.CURATOR: all_rows,
+        User.Role.PERSONNEL: user_lookups(
+            work_place__mentor__department_id="department_id"
+        ),
+        User.Role.MENTOR: user_lookups(work_place__mentor_id="id"),
+        User.Role.TRAINEE: user_lookups(work_place__trainee_id="id"),
+    }
 
     def get_permissions(self):
         if self.action in ["update", "partial_update"]:
@@ -36,17 +50,6 @@ class ReportViewSet(viewsets.ModelViewSet):
             ]
         return [permission() for permission in permission_classes]
 
-    def get_queryset(self):
-        if self.request.user.role == User.Role.PERSONNEL:
-            return self.queryset.filter(
-                work_place__mentor__department=self.request.user.department
-            )
-        if self.request.user.role == User.Role.MENTOR:
-            return self.queryset.filter(work_place__mentor=self.request.user)
-        if self.request.user.role == User.Role.TRAINEE:
-            return self.queryset.filter(work_place__trainee=self.request.user)
-        return self.queryset
-
     @action(detail=False, methods=["GET"])
     def export(self, request):
         date = request.GET.get("date", None)
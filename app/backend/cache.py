@@ -0,0 +1,100 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework.response import Response
+
+
+def _version_key(model, part=None):
+    key = f"cache_version:{model._meta.label_lower}"
+    return key if part is None else f"{key}:{part}"
+
+
+def get_versions(*models):
+    return _get_versions([_version_key(model) for model in models])
+
+
+def get_version(model, part):
+    """
+    Version of a part of the model's data, e.g. of vacancies of one direction
+    """
+    return _get_versions([_version_key(model, part)])[0]
+
+
+def _get_versions(keys):
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Start from the current time, so a lost version key can not bring
+            # back entries cached under one of the previous versions
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model, part=None):
+    """
+    Bumps the version once the current transaction is committed, an earlier
+    bump would let a concurrent reader cache the old rows under the new version
+    """
+    transaction.on_commit(lambda: _incr_version(_version_key(model, part)))
+
+
+def _incr_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def _bump_sender_version(sender, **kwargs):
+    bump_version(sender)
+
+
+def invalidate_on_change(*models):
+    """
+    Invalidate everything cached for the models on save and delete
+    """
+    for model in models:
+        for signal in (post_save, post_delete):
+            signal.connect(
+                _bump_sender_version,
+                sender=model,
+                dispatch_uid=f"bump_cache_version:{model._meta.label_lower}",
+            )
+
+
+class VersionedCacheMixin:
+    """
+    Caches list and retrieve responses of a viewset in the shared cache
+    until any of `cache_models` is changed
+    """
+
+    cache_models = ()
+    cache_timeout = settings.LOOKUP_CACHE_TIMEOUT
+
+    def get_cache_key(self, request):
+        versions = ".".join(
+            str(version) for version in get_versions(*self.cache_models)
+        )
+        return f"response:{self.basename}:{versions}:{request.get_full_path()}"
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, self.cache_timeout)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().retrieve(request, *args, **kwargs)
+        cache.set(key, response.data, self.cache_timeout)
+        return response
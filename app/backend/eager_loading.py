@@ -0,0 +1,102 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def _prefix_prefetch(prefix, prefetch):
+    return Prefetch(
+        f"{prefix}__{prefetch.prefetch_through}",
+        queryset=prefetch.queryset,
+        to_attr=prefetch.to_attr,
+    )
+
+
+def _get_field_lookups(field, model):
+    select_related, prefetch_related = [], []
+    path = []
+    for index, attr in enumerate(field.source_attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            break
+        if not model_field.is_relation or model_field.name != attr:
+            # Not a relation or its raw id, like `user_id`
+            break
+        is_last = index == len(field.source_attrs) - 1
+        path.append(attr)
+        lookup = "__".join(path)
+        model = model_field.related_model
+
+        if model_field.many_to_many or model_field.one_to_many:
+            queryset = model._default_manager.all()
+            if (
+                is_last
+                and isinstance(field, serializers.ListSerializer)
+                and isinstance(field.child, serializers.BaseSerializer)
+            ):
+                queryset = eager_load(queryset, field.child)
+            prefetch_related.append(Prefetch(lookup, queryset=queryset))
+            break
+
+        if not is_last:
+            select_related.append(lookup)
+        elif isinstance(field, serializers.BaseSerializer):
+            nested_select, nested_prefetch = get_related_lookups(field, model)
+            select_related += [lookup, *(f"{lookup}__{n}" for n in nested_select)]
+            prefetch_related += [_prefix_prefetch(lookup, p) for p in nested_prefetch]
+        elif not (
+            isinstance(field, serializers.RelatedField)
+            and field.use_pk_only_optimization()
+            # Primary keys of reverse one-to-one relations are not on the row
+            and model_field.concrete
+        ):
+            select_related.append(lookup)
+    return select_related, prefetch_related
+
+
+def get_related_lookups(serializer, model):
+    """
+    Returns `select_related` and `prefetch_related` lookups needed to render
+    instances of `model` with `serializer` without a query per instance.
+
+    Relations are taken from the sources of the declared fields: single-valued
+    ones are joined, many-valued ones are prefetched with a queryset that
+    in turn loads whatever the nested serializer renders.
+    """
+    select_related, prefetch_related = [], []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source != "*":
+            field_select, field_prefetch = _get_field_lookups(field, model)
+        elif isinstance(field, serializers.BaseSerializer):
+            field_select, field_prefetch = get_related_lookups(field, model)
+        else:
+            continue
+        select_related += field_select
+        prefetch_related += field_prefetch
+
+    unique_prefetch_related = {}
+    for prefetch in prefetch_related:
+        unique_prefetch_related.setdefault(prefetch.prefetch_to, prefetch)
+    return list(dict.fromkeys(select_related)), list(unique_prefetch_related.values())
+
+
+def eager_load(queryset, serializer):
+    select_related, prefetch_related = get_related_lookups(serializer, queryset.model)
+    return queryset.select_related(*select_related).prefetch_related(*prefetch_related)
+
+
+class EagerLoadingMixin:
+    """
+    Eager loads relations rendered by the serializer of the current action,
+    actions which render another model are left alone
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer = self.get_serializer()
+        model = getattr(getattr(serializer, "Meta", None), "model", None)
+        if model is not queryset.model:
+            return queryset
+        return eager_load(queryset, serializer)
@@ -0,0 +1,122 @@
+import datetime
+import json
+
+from django.db.models import F, Field, Func, Value
+from django.db.models.lookups import GreaterThan, LessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class Row(Func):
+    function = "ROW"
+    output_field = Field()
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        return value.isoformat()
+    raise TypeError(f"Can not use {type(value).__name__} in a cursor position")
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over a unique combination of ordering fields.
+
+    Unlike `CursorPagination`, the cursor holds values of all ordering fields
+    and the page is selected with a row comparison, e.g.
+    `(total_score, user_id) < (120, 42)`, so every page costs the same index
+    range scan no matter how many rows share the value of the first field.
+    All ordering fields must be sorted in the same direction.
+    """
+
+    page_size_query_param = "limit"
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.fields = [name.lstrip("-") for name in self.ordering]
+        descending = self.ordering[0].startswith("-")
+        assert all(
+            name.startswith("-") == descending for name in self.ordering
+        ), "All keyset ordering fields must be sorted in the same direction."
+
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        if reverse:
+            queryset = queryset.order_by(*self._reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if self.cursor is not None and self.cursor.position is not None:
+            position = self.decode_position(queryset, self.cursor.position)
+            lookup = LessThan if descending != reverse else GreaterThan
+            queryset = queryset.filter(
+                lookup(Row(*(F(name) for name in self.fields)), Row(*position))
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        has_more = len(results) > self.page_size
+        came_from_cursor = self.cursor is not None and self.cursor.position is not None
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = came_from_cursor, has_more
+        else:
+            self.has_next, self.has_previous = has_more, came_from_cursor
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        position = self.encode_position(self.page[-1])
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        position = self.encode_position(self.page[0])
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def encode_position(self, instance):
+        values = [getattr(instance, name) for name in self.fields]
+        return json.dumps(values, default=_encode_value)
+
+    def decode_position(self, queryset, position):
+        try:
+            values = json.loads(position)
+            if len(values) != len(self.fields):
+                raise ValueError
+            output_fields = [
+                queryset.query.resolve_ref(name).output_field for name in self.fields
+            ]
+            return [
+                Value(output_field.to_python(value), output_field=output_field)
+                for output_field, value in zip(output_fields, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _reverse_ordering(ordering):
+        return [name[1:] if name.startswith("-") else f"-{name}" for name in ordering]
+
+
+class OptionalKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination for endpoints which used to return everything:
+    pages only when the client asks for it with `limit` or `cursor`
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not (
+            self.page_size_query_param in request.query_params
+            or self.cursor_query_param in request.query_params
+        ):
+            return None
+        return super().paginate_queryset(queryset, request, view)
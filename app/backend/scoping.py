@@ -0,0 +1,44 @@
+from django.db.models import Q
+
+
+def user_lookups(**lookups):
+    """
+    Scope of rows whose lookups equal attributes of the user, e.g.
+    `user_lookups(vacancy__mentor_id="id")`
+    """
+
+    def scope(user):
+        return Q(**{lookup: getattr(user, attr) for lookup, attr in lookups.items()})
+
+    return scope
+
+
+def all_rows(user):
+    """
+    Scope of roles that see every row
+    """
+    return Q()
+
+
+class ScopedQuerysetMixin:
+    """
+    Limits the queryset of a viewset to rows visible to the role of the user.
+
+    `scopes` maps a role to a callable, which takes the user and returns
+    a `Q` or a boolean expression to filter by. Roles without a scope see
+    no rows, roles that see everything are declared with `all_rows`.
+    """
+
+    scopes = {}
+
+    def get_scopes(self):
+        return self.scopes
+
+    def scope_queryset(self, queryset, user):
+        scope = self.get_scopes().get(user.role)
+        if scope is None:
+            return queryset.none()
+        return queryset.filter(scope(user))
+
+    def get_queryset(self):
+        return self.scope_queryset(super().get_queryset(), self.request.user)
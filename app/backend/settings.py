@@ -50,6 +50,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "corsheaders",
     "rest_framework",
     "rest_framework_simplejwt",
@@ -107,6 +108,31 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# How long responses of lookup endpoints (departments, countries, ...) are cached,
+# entries are invalidated on changes anyway, see backend.cache.VersionedCacheMixin
+LOOKUP_CACHE_TIMEOUT = 60 * 60 * 6
+# Feeds are invalidated on vacancy changes, the timeout only bounds how long
+# changes of related objects, like a renamed mentor, may stay unnoticed
+VACANCY_FEED_CACHE_TIMEOUT = 60 * 15
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -162,7 +188,7 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 100,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.StatelessJWTAuthentication",
     ],
 }
 
@@ -180,6 +206,10 @@ SIMPLE_JWT = {
     ),
 }
 
+# How long the current token version of a user is cached, see
+# accounts.authentication.StatelessJWTAuthentication
+TOKEN_VERSION_CACHE_TIMEOUT = 60 * 60
+
 SERVER_HOST = os.getenv("SERVER_HOST", "http://127.0.0.1:8000")
 
 
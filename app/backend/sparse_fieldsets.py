@@ -0,0 +1,82 @@
+from rest_framework import serializers
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def _parse_paths(value):
+    """
+    Parses a comma separated list of dotted paths to a tree of dicts, e.g.
+    `id,vacancy.name,vacancy.mentor` to `{"id": {}, "vacancy": {"name": {},
+    "mentor": {}}}`
+    """
+    tree = {}
+    for path in value.split(","):
+        node = tree
+        for name in filter(None, path.strip().split(".")):
+            node = node.setdefault(name, {})
+    return tree
+
+
+def _collapse(name, field):
+    """
+    Replaces a nested serializer with primary keys of the related objects
+    """
+    kwargs = {"read_only": True}
+    if field.source not in (None, name):
+        kwargs["source"] = field.source
+    if isinstance(field, serializers.ListSerializer):
+        kwargs["many"] = True
+    return serializers.PrimaryKeyRelatedField(**kwargs)
+
+
+def trim_fields(fields, only, expand):
+    """
+    Trims a mapping of serializer fields in place.
+
+    Only fields present in `only` are kept, unless it is `None`. Nested
+    serializers missing from `expand` are rendered as primary keys, expanded
+    ones are trimmed with the corresponding subtrees.
+    """
+    if only is not None:
+        for name in [name for name in fields if name not in only]:
+            del fields[name]
+    for name, field in list(fields.items()):
+        nested = getattr(field, "child", field)
+        if not isinstance(nested, serializers.BaseSerializer):
+            continue
+        if field.source != "*" and name not in expand:
+            fields[name] = _collapse(name, field)
+            continue
+        # A relation listed in `only` without nested paths keeps all its fields
+        nested_only = only[name] or None if only is not None else None
+        trim_fields(nested.fields, nested_only, expand.get(name, {}))
+    return fields
+
+
+class SparseFieldsetMixin:
+    """
+    Lets clients choose what a read serializer renders.
+
+    `?fields=id,name,vacancy.name` keeps only the listed fields, dotted paths
+    select fields of nested objects. Once `fields` or `expand` is given,
+    nested objects are rendered as primary keys unless they are listed in
+    `?expand=vacancy,vacancy.mentor`. Without both parameters the full
+    representation is rendered.
+
+    Only the serializer created by the view with the request in its context
+    reads the parameters. `EagerLoadingMixin` builds its lookups from
+    the trimmed fields, so collapsed relations are neither joined
+    nor prefetched.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = getattr(self, "_context", {}).get("request")
+        if request is None:
+            return fields
+        params = request.query_params
+        if FIELDS_PARAM not in params and EXPAND_PARAM not in params:
+            return fields
+        only = _parse_paths(params[FIELDS_PARAM]) if FIELDS_PARAM in params else None
+        return trim_fields(fields, only, _parse_paths(params.get(EXPAND_PARAM, "")))
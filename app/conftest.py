@@ -1,13 +1,68 @@
 import datetime
 
 import pytest
-from accounts.models import Country, Department, Education, User
+from accounts.models import (
+    Country,
+    Department,
+    Education,
+    Link,
+    TraineeProfile,
+    User,
+    WorkExperience,
+)
 from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection
 from django.utils import timezone
-from internship.models import Direction
+from internship.models import Direction, Vacancy, VacancyResponse, WorkPlace
 from rest_framework.test import APIClient
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def query_plan():
+    """
+    EXPLAIN of a queryset with sequential scans discouraged, so the plan
+    shows whether an index can serve the query at all on a small test table.
+
+    The tables are analyzed first, so the plan depends on the rows of the
+    test only and not on statistics left by earlier tests or autovacuum.
+    """
+
+    def _query_plan(queryset):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            return queryset.explain()
+
+    return _query_plan
+
+
+@pytest.fixture
+def assert_list_num_queries(django_assert_num_queries):
+    """
+    Creates `count` objects with a `create_<objects>(count)` factory fixture
+    and checks that one page with all of them takes `num_queries` queries.
+    Parametrizing `count` with a small and a large number catches N+1 queries.
+    """
+
+    def _assert_list_num_queries(client, url, create, count, num_queries, **params):
+        create(count)
+        with django_assert_num_queries(num_queries):
+            response = client.get(url, {"limit": count, **params})
+        assert len(response.data["results"]) == count
+        return response.data["results"]
+
+    return _assert_list_num_queries
+
+
 @pytest.fixture(autouse=True)
 def preferable_country():
     return Country.objects.create(
@@ -167,3 +222,136 @@ def education(trainee_profile):
         specialization="",
         degree=Education.DegreeType.BACHELOR,
     )
+
+
+@pytest.fixture
+def create_filled_profiles(preferable_country):
+    """
+    Bulk creates candidates with a link, an education and a work experience
+    in their profiles
+    """
+
+    def _create_filled_profiles(count):
+        password = make_password(None)
+        users = User.objects.bulk_create(
+            (
+                User(
+                    username=f"candidate{i}@user.com",
+                    email=f"candidate{i}@user.com",
+                    password=password,
+                    role=User.Role.CANDIDATE,
+                )
+                for i in range(count)
+            ),
+            batch_size=5000,
+        )
+        profiles = TraineeProfile.objects.bulk_create(
+            (
+                TraineeProfile(user=user, citizenship=preferable_country)
+                for user in users
+            ),
+            batch_size=5000,
+        )
+        Link.objects.bulk_create(
+            (Link(profile=profile, url="https://example.com") for profile in profiles),
+            batch_size=5000,
+        )
+        Education.objects.bulk_create(
+            (
+                Education(
+                    profile=profile,
+                    name="University",
+                    type=Education.Type.UNIVERSITY,
+                    start_year=2018,
+                    specialization="",
+                )
+                for profile in profiles
+            ),
+            batch_size=5000,
+        )
+        WorkExperience.objects.bulk_create(
+            (
+                WorkExperience(
+                    profile=profile,
+                    employer="Employer",
+                    position="Developer",
+                    start_date=datetime.date(2020, 1, 1),
+                    description="",
+                )
+                for profile in profiles
+            ),
+            batch_size=5000,
+        )
+        return profiles
+
+    return _create_filled_profiles
+
+
+@pytest.fixture
+def create_other_work_places(department2):
+    """
+    Bulk creates work places of other mentors and trainees in another
+    department, so analyzed tables have rows the scopes of test users skip
+    """
+
+    def _create_other_work_places(count):
+        password = make_password(None)
+        mentors, trainees = [
+            User.objects.bulk_create(
+                User(
+                    username=f"other_{role}{i}@user.com",
+                    email=f"other_{role}{i}@user.com",
+                    password=password,
+                    role=role,
+                    department=department2 if role == User.Role.MENTOR else None,
+                )
+                for i in range(count)
+            )
+            for role in (User.Role.MENTOR, User.Role.TRAINEE)
+        ]
+        return WorkPlace.objects.bulk_create(
+            WorkPlace(
+                name=f"Work place {i}",
+                trainee=trainee,
+                mentor=mentor,
+                department=department2,
+            )
+            for i, (mentor, trainee) in enumerate(zip(mentors, trainees))
+        )
+
+    return _create_other_work_places
+
+
+@pytest.fixture
+def create_other_vacancy_responses(
+    create_filled_profiles, create_user, direction, department2
+):
+    """
+    Bulk creates responses of new candidates to vacancies of another mentor
+    and department, so analyzed tables have rows the scopes of test users skip
+    """
+
+    def _create_other_vacancy_responses(count):
+        other_mentor = create_user(
+            role=User.Role.MENTOR, username="mentor2@user.com", department=department2
+        )
+        vacancies = Vacancy.objects.bulk_create(
+            Vacancy(
+                name=f"Vacancy {i}",
+                description="Test description",
+                status=Vacancy.Status.PUBLISHED,
+                mentor=other_mentor,
+                owner=other_mentor,
+                direction=direction,
+                department=department2,
+            )
+            for i in range(count // 5)
+        )
+        return VacancyResponse.objects.bulk_create(
+            VacancyResponse(
+                vacancy=vacancies[i % len(vacancies)], applicant=profile, text_answer=""
+            )
+            for i, profile in enumerate(create_filled_profiles(count))
+        )
+
+    return _create_other_vacancy_responses
@@ -4,3 +4,46 @@ from django.apps import AppConfig
 class InternshipConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "internship"
+
+    def ready(self):
+        from accounts.models import Education, TraineeProfile
+        from backend.cache import invalidate_on_change
+        from django.db.models.signals import m2m_changed, post_delete, post_save
+        from internship import signals
+        from internship.models import (
+            Direction,
+            Event,
+            FeedBack,
+            InternshipApplication,
+            Qualification,
+            Vacancy,
+            WorkPlace,
+        )
+
+        invalidate_on_change(Direction, Qualification)
+        # Calendar ETags of events
+        invalidate_on_change(Event, WorkPlace)
+        # Before the availability handler, which resets the loaded mentor
+        for signal in (post_save, post_delete):
+            signal.connect(signals.forget_current_work_places, sender=WorkPlace)
+        for model in (Vacancy, WorkPlace):
+            post_save.connect(signals.update_availability_on_save, sender=model)
+            post_delete.connect(signals.update_availability_on_delete, sender=model)
+        post_save.connect(signals.invalidate_feed_on_save, sender=Vacancy)
+        post_delete.connect(signals.invalidate_feed_on_delete, sender=Vacancy)
+        m2m_changed.connect(
+            signals.invalidate_feed_on_qualifications_change,
+            sender=Vacancy.required_qualifications.through,
+        )
+        for signal in (post_save, post_delete):
+            signal.connect(
+                signals.forget_application_direction, sender=InternshipApplication
+            )
+            signal.connect(
+                signals.update_recommendation_on_education_change, sender=Education
+            )
+        post_save.connect(
+            signals.update_recommendation_on_profile_change, sender=TraineeProfile
+        )
+        post_save.connect(signals.update_feedback_summary_on_save, sender=FeedBack)
+        post_delete.connect(signals.update_feedback_summary_on_delete, sender=FeedBack)
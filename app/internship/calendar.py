@@ -0,0 +1,59 @@
+import datetime
+
+from django.utils import timezone
+
+# Lines longer than this many octets are folded, see RFC 5545, 3.1
+MAX_LINE_OCTETS = 75
+
+
+def escape_text(value):
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def format_datetime(value):
+    return value.astimezone(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def fold_line(line):
+    """
+    Splits a content line into chunks of at most 75 octets without breaking
+    UTF-8 characters, continuation lines start with a space
+    """
+    chunks, chunk, size = [], "", 0
+    for char in line:
+        char_size = len(char.encode())
+        if size + char_size > MAX_LINE_OCTETS:
+            chunks.append(chunk)
+            # The leading space of a continuation line counts too
+            chunk, size = " ", 1
+        chunk += char
+        size += char_size
+    chunks.append(chunk)
+    return "\r\n".join(chunks) + "\r\n"
+
+
+def iter_calendar(events, domain):
+    """
+    Yields an iCalendar document line by line from an iterable of event
+    dicts with `id`, `name`, `description` and `datetime`
+    """
+    stamp = format_datetime(timezone.now())
+    yield fold_line("BEGIN:VCALENDAR")
+    yield fold_line("VERSION:2.0")
+    yield fold_line(f"PRODID:-//{domain}//Internship events//RU")
+    for event in events:
+        yield fold_line("BEGIN:VEVENT")
+        yield fold_line(f"UID:event-{event['id']}@{domain}")
+        yield fold_line(f"DTSTAMP:{stamp}")
+        yield fold_line(f"DTSTART:{format_datetime(event['datetime'])}")
+        yield fold_line(f"SUMMARY:{escape_text(event['name'])}")
+        if event["description"]:
+            yield fold_line(f"DESCRIPTION:{escape_text(event['description'])}")
+        yield fold_line("END:VEVENT")
+    yield fold_line("END:VCALENDAR")
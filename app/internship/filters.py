@@ -1,5 +1,7 @@
 import django_filters
-from internship.models import Event
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+from internship.models import Event, Vacancy
 
 
 class EventFilterSet(django_filters.FilterSet):
@@ -9,6 +11,8 @@ class EventFilterSet(django_filters.FilterSet):
     datetime_to = django_filters.DateTimeFilter(
         field_name="datetime", lookup_expr="lte"
     )
+    trainee = django_filters.NumberFilter(field_name="workplace__trainee_id")
+    mentor = django_filters.NumberFilter(field_name="workplace__mentor_id")
 
     class Meta:
         model = Event
@@ -16,5 +20,32 @@ class EventFilterSet(django_filters.FilterSet):
             "datetime_from",
             "datetime_to",
             "workplace",
+            "trainee",
+            "mentor",
             "name",
         ]
+
+
+class VacancyFilterSet(django_filters.FilterSet):
+    search = django_filters.CharFilter(method="filter_search")
+
+    class Meta:
+        model = Vacancy
+        fields = [
+            "direction",
+            "status",
+            "reviewed_by",
+            "department",
+            "schedule",
+            "search",
+        ]
+
+    def filter_search(self, queryset, name, value):
+        query = SearchQuery(
+            value, config="russian", search_type="websearch"
+        ) | SearchQuery(value, config="english", search_type="websearch")
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "-id")
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from internship.models import InternshipApplication
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчет рекомендаций по всем заявкам на стажировку, например после "
+        "изменения PREFERABLE_CITIZENSHIP_ID или REQUIRED_UNIVERSITY_YEARS"
+    )
+
+    def handle(self, *args, **options):
+        count = InternshipApplication.objects.update_recommendations()
+        self.stdout.write(self.style.SUCCESS(f"Updated {count} applications"))
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("internship", "0016_event"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="vacancyresponse",
+            index=models.Index(
+                fields=["applicant", "vacancy"], name="vacancy_response_applicant_idx"
+            ),
+        ),
+    ]
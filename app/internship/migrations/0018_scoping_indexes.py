@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("internship", "0017_vacancy_response_applicant_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="vacancy",
+            index=models.Index(
+                fields=["mentor", "status"], name="vacancy_mentor_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workplace",
+            index=models.Index(
+                fields=["mentor", "is_active"], name="work_place_mentor_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workplace",
+            index=models.Index(
+                fields=["department", "is_active"], name="work_place_department_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:03
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+# Points vacancies at the oldest of the qualifications with the same name
+# and deletes the rest
+MERGE_DUPLICATES = [
+    "UPDATE internship_qualification SET name = trim(name) WHERE name <> trim(name)",
+    """
+    CREATE TEMPORARY TABLE qualification_duplicate ON COMMIT DROP AS
+    SELECT id, keep_id FROM (
+        SELECT id, min(id) OVER (PARTITION BY lower(name)) AS keep_id
+        FROM internship_qualification
+    ) qualification WHERE id <> keep_id
+    """,
+    """
+    INSERT INTO internship_vacancy_required_qualifications (vacancy_id, qualification_id)
+    SELECT DISTINCT t.vacancy_id, d.keep_id
+    FROM internship_vacancy_required_qualifications t
+    JOIN qualification_duplicate d ON d.id = t.qualification_id
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    DELETE FROM internship_vacancy_required_qualifications t
+    USING qualification_duplicate d WHERE t.qualification_id = d.id
+    """,
+    """
+    DELETE FROM internship_qualification q
+    USING qualification_duplicate d WHERE q.id = d.id
+    """,
+    # Run deferred foreign key checks, the index can not be created before
+    "SET CONSTRAINTS ALL IMMEDIATE",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("internship", "0018_scoping_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(MERGE_DUPLICATES, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name="qualification",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("name"),
+                name="unique_qualification_name",
+            ),
+        ),
+    ]
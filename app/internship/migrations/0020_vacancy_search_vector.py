@@ -0,0 +1,101 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+CREATE_TRIGGERS = """
+CREATE FUNCTION internship_vacancy_search_vector(
+    vacancy_id bigint, name text, description text
+) RETURNS tsvector AS $$
+    SELECT
+        setweight(to_tsvector('russian', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('russian', coalesce(description, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        || setweight(to_tsvector('russian', coalesce(qualifications.names, '')), 'C')
+        || setweight(to_tsvector('english', coalesce(qualifications.names, '')), 'C')
+    FROM (
+        SELECT string_agg(q.name, ' ') AS names
+        FROM internship_vacancy_required_qualifications vq
+        JOIN internship_qualification q ON q.id = vq.qualification_id
+        WHERE vq.vacancy_id = $1
+    ) qualifications
+$$ LANGUAGE sql STABLE;
+
+CREATE FUNCTION internship_vacancy_search_vector_trigger() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := internship_vacancy_search_vector(
+        NEW.id, NEW.name, NEW.description
+    );
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER internship_vacancy_search_vector
+BEFORE INSERT OR UPDATE OF name, description, search_vector ON internship_vacancy
+FOR EACH ROW EXECUTE FUNCTION internship_vacancy_search_vector_trigger();
+
+CREATE FUNCTION internship_vacancy_qualifications_trigger() RETURNS trigger AS $$
+BEGIN
+    -- The vacancy trigger recomputes the vector when it is reset
+    IF TG_TABLE_NAME = 'internship_qualification' THEN
+        UPDATE internship_vacancy SET search_vector = NULL
+        WHERE id IN (
+            SELECT vacancy_id FROM internship_vacancy_required_qualifications
+            WHERE qualification_id = NEW.id
+        );
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE internship_vacancy SET search_vector = NULL WHERE id = OLD.vacancy_id;
+    ELSE
+        UPDATE internship_vacancy SET search_vector = NULL WHERE id = NEW.vacancy_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER internship_vacancy_required_qualifications_search_vector
+AFTER INSERT OR UPDATE OR DELETE ON internship_vacancy_required_qualifications
+FOR EACH ROW EXECUTE FUNCTION internship_vacancy_qualifications_trigger();
+
+CREATE TRIGGER internship_qualification_search_vector
+AFTER UPDATE OF name ON internship_qualification
+FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+EXECUTE FUNCTION internship_vacancy_qualifications_trigger();
+
+UPDATE internship_vacancy SET search_vector = NULL;
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER internship_qualification_search_vector ON internship_qualification;
+DROP TRIGGER internship_vacancy_required_qualifications_search_vector
+ON internship_vacancy_required_qualifications;
+DROP TRIGGER internship_vacancy_search_vector ON internship_vacancy;
+DROP FUNCTION internship_vacancy_qualifications_trigger();
+DROP FUNCTION internship_vacancy_search_vector_trigger();
+DROP FUNCTION internship_vacancy_search_vector(bigint, text, text);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("internship", "0019_unique_qualification_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vacancy",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vacancy",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="vacancy_search_idx"
+            ),
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("internship", "0020_vacancy_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="vacancy",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["direction"],
+                name="vacancy_published_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("internship", "0021_vacancy_published_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["datetime", "id"], name="event_datetime_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="feedback",
+            index=models.Index(fields=["date", "id"], name="feedback_date_idx"),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("internship", "0022_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="workplace",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["trainee"],
+                name="work_place_active_trainee_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("internship", "0023_work_place_active_trainee_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["workplace", "datetime"], name="event_workplace_datetime_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("internship", "0024_event_workplace_datetime_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="feedback",
+            index=models.Index(
+                fields=["to_user", "date"], name="feedback_to_user_date_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+# Status and counter updates do not change the indexed text, the qualification
+# triggers reset search_vector to get the vector recomputed
+CREATE_TRIGGER = """
+DROP TRIGGER internship_vacancy_search_vector ON internship_vacancy;
+CREATE TRIGGER internship_vacancy_search_vector
+BEFORE INSERT OR UPDATE OF name, description, search_vector ON internship_vacancy
+FOR EACH ROW EXECUTE FUNCTION internship_vacancy_search_vector_trigger();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER internship_vacancy_search_vector ON internship_vacancy;
+CREATE TRIGGER internship_vacancy_search_vector
+BEFORE INSERT OR UPDATE ON internship_vacancy
+FOR EACH ROW EXECUTE FUNCTION internship_vacancy_search_vector_trigger();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("internship", "0025_feedback_to_user_date_idx"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
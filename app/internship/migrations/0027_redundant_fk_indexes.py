@@ -0,0 +1,54 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:48
+
+# vacancy_mentor_status_idx, work_place_mentor_idx and work_place_department_idx
+# start with these columns and serve the same lookups
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0019_redundant_fk_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("internship", "0026_vacancy_search_vector_trigger_columns"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="vacancy",
+            name="mentor",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="mentor_of",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Mentor",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="workplace",
+            name="department",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="accounts.department",
+                verbose_name="Department",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="workplace",
+            name="mentor",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="mentor_on",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Mentor",
+            ),
+        ),
+    ]
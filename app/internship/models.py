@@ -1,12 +1,145 @@
 from accounts.models import Department, Education, TraineeProfile, User
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.core.cache import cache
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
-from django.db.models import F
-from django.db.models.functions import Coalesce
+from django.db import OperationalError, connection, models, transaction
+from django.db.models import (
+    Count,
+    Exists,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+)
+from django.db.models.functions import Coalesce, Lower
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+# SQLSTATE of a lock that NOWAIT could not take
+LOCK_NOT_AVAILABLE = "55P03"
+
+# Key of the advisory lock held while the selection results are written
+SELECTION_LOCK_ID = 1_150_427_001
+
+
+class InternshipApplicationQuerySet(models.QuerySet):
+    def update_recommendations(self):
+        """
+        Recomputes `is_recommended` of the applications in one UPDATE.
+
+        A candidate is recommended when they are a citizen of the preferable
+        country and started a bachelor's university education at least
+        `REQUIRED_UNIVERSITY_YEARS` years before its end or the current year.
+        Returns the number of updated applications.
+        """
+        preferable_citizen = TraineeProfile.objects.filter(
+            user_id=OuterRef("applicant_id"),
+            citizenship_id=settings.PREFERABLE_CITIZENSHIP_ID,
+        )
+        university = Education.objects.filter(
+            profile_id=OuterRef("applicant_id"),
+            start_year__lte=Coalesce(F("end_year"), timezone.now().date().year)
+            - settings.REQUIRED_UNIVERSITY_YEARS,
+            type=Education.Type.UNIVERSITY,
+            degree=Education.DegreeType.BACHELOR,
+        )
+        # TODO: check relevancy of job experience
+        return self.update(
+            is_recommended=ExpressionWrapper(
+                Exists(preferable_citizen) & Exists(university),
+                output_field=models.BooleanField(),
+            )
+        )
+
+
+class InternshipApplicationManager(
+    models.Manager.from_queryset(InternshipApplicationQuerySet)
+):
+    def get_direction_id(self, user_id):
+        key = InternshipApplication.direction_cache_key(user_id)
+        direction_id = cache.get(key)
+        if direction_id is None:
+            direction_id = (
+                self.filter(applicant_id=user_id)
+                .values_list("direction_id", flat=True)
+                .first()
+            )
+            if direction_id is not None:
+                cache.set(key, direction_id, settings.LOOKUP_CACHE_TIMEOUT)
+        return direction_id
+
+    @transaction.atomic
+    def end_up_selection(self, selection_count, changed_by_id):
+        """
+        Approves applications of the best `selection_count` candidates
+        who passed the test, making them trainees, and rejects the rest.
+
+        Runs as a single statement under an advisory lock, so concurrent
+        calls are serialized. Applications which already have the resulting
+        status are left untouched, re-running the selection changes nothing.
+        """
+        applications = self.model._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [SELECTION_LOCK_ID])
+            cursor.execute(
+                f"""
+                WITH ranked AS (
+                    SELECT
+                        a.applicant_id,
+                        row_number() OVER (
+                            ORDER BY p.cv_score + p.test_score DESC, p.user_id DESC
+                        ) <= %(selection_count)s AS approved
+                    FROM {applications} a
+                    JOIN {TraineeProfile._meta.db_table} p
+                        ON p.user_id = a.applicant_id
+                    WHERE p.test_status = %(passed)s
+                ),
+                updated_applications AS (
+                    UPDATE {applications} a
+                    SET
+                        status = CASE WHEN r.approved
+                            THEN %(approved)s ELSE %(rejected)s END,
+                        status_changed_at = %(now)s,
+                        status_changed_by_id = %(changed_by_id)s
+                    FROM ranked r
+                    WHERE a.applicant_id = r.applicant_id
+                        AND a.status <> CASE WHEN r.approved
+                            THEN %(approved)s ELSE %(rejected)s END
+                ),
+                promoted_users AS (
+                    UPDATE {User._meta.db_table} u
+                    SET role = %(trainee)s, token_version = u.token_version + 1
+                    FROM ranked r
+                    WHERE u.id = r.applicant_id AND r.approved AND u.role <> %(trainee)s
+                    RETURNING u.id
+                )
+                SELECT
+                    count(*),
+                    count(*) FILTER (WHERE approved),
+                    ARRAY(SELECT id FROM promoted_users)
+                FROM ranked
+                """,
+                {
+                    "selection_count": selection_count,
+                    "passed": TraineeProfile.QualifyingStatus.PASSED,
+                    "approved": InternshipApplication.Status.APPROVED,
+                    "rejected": InternshipApplication.Status.REJECTED,
+                    "trainee": User.Role.TRAINEE,
+                    "now": timezone.now(),
+                    "changed_by_id": changed_by_id,
+                },
+            )
+            count, approved, promoted_user_ids = cursor.fetchone()
+        # Roles are part of JWT claims, tokens of promoted users must be reissued
+        transaction.on_commit(
+            lambda: User.objects.forget_token_versions(promoted_user_ids)
+        )
+        return {"count": count, "approved": approved, "rejected": count - approved}
+
 
 class InternshipApplication(models.Model):
     class Status(models.TextChoices):
@@ -41,29 +174,16 @@ class InternshipApplication(models.Model):
         null=True,
     )
 
-    def set_recommendation(self):
-        self.is_recommended = self._calculate_recommendation()
-        self.save()
-        return self
+    objects = InternshipApplicationManager()
 
-    def _calculate_recommendation(self):
-        if (
-            self.applicant.trainee_profile.citizenship_id
-            != settings.PREFERABLE_CITIZENSHIP_ID
-        ):
-            return False
+    @staticmethod
+    def direction_cache_key(user_id):
+        return f"internship:user:{user_id}:direction"
 
-        required_university_years = settings.REQUIRED_UNIVERSITY_YEARS
-        university_criteria = self.applicant.trainee_profile.educations.filter(
-            start_year__lte=Coalesce(F("end_year"), timezone.now().date().year)
-            - required_university_years,
-            type=Education.Type.UNIVERSITY,
-            degree=Education.DegreeType.BACHELOR,
-        ).exists()
-        if not university_criteria:
-            return False
-        # TODO: check relevancy of job experience
-        return True
+    def set_recommendation(self):
+        InternshipApplication.objects.filter(pk=self.pk).update_recommendations()
+        self.refresh_from_db(fields=["is_recommended"])
+        return self
 
 
 class TestTask(models.Model):
@@ -92,12 +212,69 @@ class Direction(models.Model):
         return self.name
 
 
+class QualificationManager(models.Manager):
+    def resolve(self, names):
+        """
+        Returns qualifications with the names, matched case-insensitively,
+        creating the missing ones in the same query. Created qualifications
+        have `created` set to True.
+        """
+        unique_names = {}
+        for name in names:
+            name = name.strip()
+            unique_names.setdefault(name.lower(), name)
+        if not unique_names:
+            return []
+        table = self.model._meta.db_table
+        # Rows inserted by the CTE are not visible to the outer query, so
+        # existing and created qualifications do not overlap
+        query = f"""
+            WITH input AS (SELECT unnest(%s::varchar[]) AS name),
+            inserted AS (
+                INSERT INTO {table} (name) SELECT name FROM input
+                ON CONFLICT (lower(name)) DO NOTHING
+                RETURNING id, name
+            )
+            SELECT id, name, true AS created FROM inserted
+            UNION ALL
+            SELECT q.id, q.name, false FROM {table} q
+            JOIN input ON lower(q.name) = lower(input.name)
+        """
+        params = [list(unique_names.values())]
+        qualifications = list(self.raw(query, params))
+        if len(qualifications) < len(unique_names):
+            # Names inserted by a concurrent transaction after this query
+            # started are skipped by both parts, they are visible on retry
+            qualifications = list(self.raw(query, params))
+        return qualifications
+
+
 class Qualification(models.Model):
     id = models.BigAutoField(primary_key=True)
     name = models.CharField(max_length=255)
 
+    objects = QualificationManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(Lower("name"), name="unique_qualification_name"),
+        ]
 
-class Vacancy(models.Model):
+
+class MentorTrackingMixin:
+    """
+    Remembers the mentor the instance was loaded with, so availability
+    of the previous mentor is updated too when the mentor is changed
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_mentor_id = instance.__dict__.get("mentor_id")
+        return instance
+
+
+class Vacancy(MentorTrackingMixin, models.Model):
     class Status(models.TextChoices):
         PENDING = "pending", _("Pending")
         REJECTED = "rejected", _("Rejected")
@@ -139,6 +316,7 @@ class Vacancy(models.Model):
         verbose_name="Reviewed by",
         related_name="reviewed_vacancies",
     )
+    # Served by vacancy_mentor_status_idx, which starts with the mentor
     mentor = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -146,6 +324,7 @@ class Vacancy(models.Model):
         null=True,
         verbose_name="Mentor",
         related_name="mentor_of",
+        db_index=False,
     )
     test_task = models.ForeignKey(
         TestTask,
@@ -165,9 +344,35 @@ class Vacancy(models.Model):
         default=ScheduleType.FULL_TIME,
         verbose_name="Status",
     )
+    # Maintained by database triggers from the name, description and
+    # required qualifications, see migration 0020_vacancy_search_vector
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name_plural = "Vacancies"
+        indexes = [
+            models.Index(
+                fields=["direction"],
+                name="vacancy_published_idx",
+                condition=models.Q(status="published"),
+            ),
+            GinIndex(fields=["search_vector"], name="vacancy_search_idx"),
+            models.Index(fields=["mentor", "status"], name="vacancy_mentor_status_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_feed_direction_id = instance.get_feed_direction_id()
+        return instance
+
+    def get_feed_direction_id(self):
+        """
+        Direction whose feed of published vacancies lists the vacancy, if any
+        """
+        if self.__dict__.get("status") == Vacancy.Status.PUBLISHED:
+            return self.__dict__.get("direction_id")
+        return None
 
 
 class VacancyResponse(models.Model):
@@ -190,9 +395,71 @@ class VacancyResponse(models.Model):
         db_table = "internship_vacancy_response"
         verbose_name_plural = "Vacancy responses"
         unique_together = [["vacancy", "applicant"]]
-
-
-class WorkPlace(models.Model):
+        indexes = [
+            # Lookups of responses of a user, e.g. scoping of UserViewSet
+            models.Index(
+                fields=["applicant", "vacancy"], name="vacancy_response_applicant_idx"
+            ),
+        ]
+
+    @transaction.atomic
+    def approve(self):
+        """
+        Closes the vacancy and gives the applicant a work place with its mentor.
+
+        Only the vacancy row is locked and the lock is not waited for:
+        returns `None` when the vacancy is already closed or another approval
+        is holding it.
+        """
+        try:
+            with transaction.atomic():
+                vacancy = (
+                    Vacancy.objects.select_for_update(nowait=True)
+                    .exclude(status=Vacancy.Status.CLOSED)
+                    .get(pk=self.vacancy_id)
+                )
+        except Vacancy.DoesNotExist:
+            return None
+        except OperationalError as e:
+            if getattr(e.__cause__, "pgcode", None) != LOCK_NOT_AVAILABLE:
+                raise
+            return None
+        vacancy.status = Vacancy.Status.CLOSED
+        vacancy.save(update_fields=["status"])
+        self.vacancy = vacancy
+        return WorkPlace.objects.create(
+            name=vacancy.name,
+            vacancy=vacancy,
+            trainee_id=self.applicant_id,
+            mentor_id=vacancy.mentor_id,
+            department_id=vacancy.department_id,
+        )
+
+
+class WorkPlaceManager(models.Manager):
+    def get_current_id(self, user_id, role):
+        """
+        Id of the active work place of a trainee or a mentor, cached until
+        a work place of the user is saved or deleted
+        """
+        lookup = {User.Role.TRAINEE: "trainee_id", User.Role.MENTOR: "mentor_id"}
+        if role not in lookup:
+            return None
+        key = WorkPlace.current_cache_key(user_id, role)
+        work_place_id = cache.get(key)
+        if work_place_id is None:
+            work_place_id = (
+                self.filter(**{lookup[role]: user_id}, is_active=True)
+                .order_by("pk")
+                .values_list("id", flat=True)
+                .first()
+            )
+            if work_place_id is not None:
+                cache.set(key, work_place_id, settings.LOOKUP_CACHE_TIMEOUT)
+        return work_place_id
+
+
+class WorkPlace(MentorTrackingMixin, models.Model):
     name = models.CharField(max_length=255, verbose_name=_("Name"))
     vacancy = models.OneToOneField(
         Vacancy,
@@ -207,22 +474,113 @@ class WorkPlace(models.Model):
         related_name="work_on",
         verbose_name=_("Trainee"),
     )
+    # Mentor and department lookups are served by work_place_mentor_idx
+    # and work_place_department_idx, which start with these columns
     mentor = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
         related_name="mentor_on",
         verbose_name=_("Mentor"),
+        db_index=False,
     )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
     updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated at"))
     is_active = models.BooleanField(default=True, verbose_name=_("Is active"))
     department = models.ForeignKey(
-        Department, on_delete=models.CASCADE, verbose_name="Department"
+        Department, on_delete=models.CASCADE, verbose_name="Department", db_index=False
     )
 
+    objects = WorkPlaceManager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # The cached current work place of the previous trainee is forgotten
+        # when the trainee is changed
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_trainee_id = instance.__dict__.get("trainee_id")
+        return instance
+
     class Meta:
         db_table = "attendance_work_place"
         verbose_name_plural = "Work places"
+        indexes = [
+            models.Index(fields=["mentor", "is_active"], name="work_place_mentor_idx"),
+            models.Index(
+                fields=["department", "is_active"], name="work_place_department_idx"
+            ),
+            models.Index(
+                fields=["trainee"],
+                condition=Q(is_active=True),
+                name="work_place_active_trainee_idx",
+            ),
+        ]
+
+    @staticmethod
+    def current_cache_key(user_id, role):
+        return f"internship:user:{user_id}:{role}:work_place"
+
+
+def _count(queryset):
+    return Coalesce(
+        Subquery(
+            queryset.filter(mentor_id=OuterRef("pk"))
+            .values("mentor_id")
+            .annotate(count=Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def update_mentor_availability(mentor_ids):
+    """
+    Recounts open vacancies and active work places of the mentors
+    """
+    mentor_ids = {pk for pk in mentor_ids if pk is not None}
+    if not mentor_ids:
+        return
+    User.objects.filter(pk__in=mentor_ids).update(
+        open_vacancy_count=_count(
+            Vacancy.objects.exclude(status=Vacancy.Status.CLOSED)
+        ),
+        active_work_place_count=_count(WorkPlace.objects.filter(is_active=True)),
+    )
+
+
+def _last_feedback_date():
+    return Subquery(
+        FeedBack.objects.filter(to_user_id=OuterRef("pk"))
+        .order_by("-date")
+        .values("date")[:1]
+    )
+
+
+def change_feedback_summary(user_id, count, rating_sum):
+    """
+    Adds to the feedback counters of a user in place. The last feedback date
+    is looked up again, which is a single index probe.
+    """
+    User.objects.filter(pk=user_id).update(
+        feedback_count=F("feedback_count") + count,
+        feedback_rating_sum=F("feedback_rating_sum") + rating_sum,
+        last_feedback_date=_last_feedback_date(),
+    )
+
+
+def recount_feedback_summary(user_ids):
+    """
+    Recounts feedback summaries of the users from scratch
+    """
+    feedbacks = FeedBack.objects.filter(to_user_id=OuterRef("pk")).values("to_user_id")
+    User.objects.filter(pk__in=user_ids).update(
+        feedback_count=Coalesce(
+            Subquery(feedbacks.annotate(count=Count("id")).values("count")), 0
+        ),
+        feedback_rating_sum=Coalesce(
+            Subquery(feedbacks.annotate(sum=Sum("rating")).values("sum")), 0
+        ),
+        last_feedback_date=_last_feedback_date(),
+    )
 
 
 class FeedBack(models.Model):
@@ -238,6 +596,23 @@ class FeedBack(models.Model):
     )
     text = models.TextField(max_length=255)
 
+    class Meta:
+        indexes = [
+            # Pages of the feedback list, see `FeedBackPagination`
+            models.Index(fields=["date", "id"], name="feedback_date_idx"),
+            # Last feedback date of a user, see `change_feedback_summary`
+            models.Index(fields=["to_user", "date"], name="feedback_to_user_date_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_rating = (
+            instance.__dict__.get("to_user_id"),
+            instance.__dict__.get("rating"),
+        )
+        return instance
+
     def __str__(self):
         return f"FeedBack from {self.from_user} to {self.to_user} at {self.date}"
 
@@ -250,5 +625,15 @@ class Event(models.Model):
         WorkPlace, on_delete=models.CASCADE, related_name="events"
     )
 
+    class Meta:
+        indexes = [
+            # Pages of the event list, see `EventPagination`
+            models.Index(fields=["datetime", "id"], name="event_datetime_idx"),
+            # Calendar ranges of a work place, e.g. `EventFilterSet`
+            models.Index(
+                fields=["workplace", "datetime"], name="event_workplace_datetime_idx"
+            ),
+        ]
+
     def __str__(self):
         return str(self.name)
@@ -5,6 +5,8 @@ from accounts.serializers import (
     UserSerializer,
     UserWithProfileSerialization,
 )
+from backend.cache import bump_version
+from backend.sparse_fieldsets import SparseFieldsetMixin
 from django.db import transaction
 from django.utils import timezone
 from internship.models import (
@@ -22,7 +24,9 @@ from rest_framework import serializers
 from rest_framework.exceptions import PermissionDenied
 
 
-class ReadInternshipApplicationSerializer(serializers.ModelSerializer):
+class ReadInternshipApplicationSerializer(
+    SparseFieldsetMixin, serializers.ModelSerializer
+):
     applicant = UserWithProfileSerialization()
     status_changed_by = UserSerializer()
     is_recommended = serializers.BooleanField()  # TODO: hide field for candidate
@@ -86,7 +90,7 @@ class TestTaskSerializer(serializers.ModelSerializer):
         )
 
 
-class ReadVacancySerializer(serializers.ModelSerializer):
+class ReadVacancySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     required_qualifications = QualificationSerializer(many=True)
     direction = DirectionSerializer()
     department = DepartmentSerializer()
@@ -115,6 +119,13 @@ class ReadVacancySerializer(serializers.ModelSerializer):
         ]
 
 
+def resolve_qualifications(names):
+    qualifications = Qualification.objects.resolve(names)
+    if any(qualification.created for qualification in qualifications):
+        bump_version(Qualification)
+    return qualifications
+
+
 class VacancySerializer(serializers.ModelSerializer):
     required_qualifications = serializers.ListSerializer(child=serializers.CharField())
     test_task = TestTaskSerializer()
@@ -161,9 +172,7 @@ class VacancySerializer(serializers.ModelSerializer):
         serializer.is_valid(raise_exception=True)
         test_task = serializer.save()
         vacancy = Vacancy.objects.create(**validated_data, test_task=test_task)
-        qualifications = [Qualification(name=name) for name in qualifications]
-        qualifications = Qualification.objects.bulk_create(qualifications)
-        vacancy.required_qualifications.set(qualifications)
+        vacancy.required_qualifications.set(resolve_qualifications(qualifications))
         vacancy.save()
         return vacancy
 
@@ -186,13 +195,11 @@ class VacancySerializer(serializers.ModelSerializer):
             instance.test_task = test_task
         qualifications = validated_data.pop("required_qualifications", None)
         if qualifications is not None:
-            qualifications = [Qualification(name=name) for name in qualifications]
-            qualifications = Qualification.objects.bulk_create(qualifications)
-            instance.required_qualifications.set(qualifications)
+            instance.required_qualifications.set(resolve_qualifications(qualifications))
         return super().update(instance, validated_data)
 
 
-class ReadVacancyResponseSerializer(serializers.ModelSerializer):
+class ReadVacancyResponseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     vacancy = ReadVacancySerializer()
     applicant = ReadTraineeProfileSerializer()
 
@@ -243,11 +250,28 @@ class VacancyResponseSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class ReadWorkPlaceSerializer(serializers.ModelSerializer):
+class WorkPlaceVacancySerializer(serializers.ModelSerializer):
+    """
+    Read side of `VacancySerializer` for work place lists, renders names
+    of the qualifications prefetched by the viewset
+    """
+
+    required_qualifications = serializers.SlugRelatedField(
+        slug_field="name", many=True, read_only=True
+    )
+    test_task = TestTaskSerializer(read_only=True)
+
+    class Meta:
+        model = Vacancy
+        fields = VacancySerializer.Meta.fields
+        read_only_fields = fields
+
+
+class ReadWorkPlaceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     trainee = UserSerializer()
     mentor = UserSerializer()
     department = DepartmentSerializer()
-    vacancy = VacancySerializer()
+    vacancy = WorkPlaceVacancySerializer()
 
     class Meta:
         model = WorkPlace
@@ -282,6 +306,15 @@ class CountSerializer(serializers.Serializer):
     count = serializers.IntegerField()
 
 
+class CalendarSubscriptionSerializer(serializers.Serializer):
+    url = serializers.URLField()
+
+
+class SelectionResultSerializer(CountSerializer):
+    approved = serializers.IntegerField()
+    rejected = serializers.IntegerField()
+
+
 class ReadFeedbackSerializer(serializers.ModelSerializer):
     from_user = UserSerializer()
     to_user = UserSerializer()
@@ -314,7 +347,7 @@ class FeedbackSerializer(serializers.ModelSerializer):
         return FeedBack.objects.create(**validated_data)
 
 
-class ReadEventSerializer(serializers.ModelSerializer):
+class ReadEventSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     workplace = WorkPlaceSerializer()
 
     class Meta:
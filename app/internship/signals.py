@@ -0,0 +1,114 @@
+from accounts.models import User
+from backend.cache import bump_version
+from django.core.cache import cache
+from django.db import transaction
+from internship.models import (
+    InternshipApplication,
+    Vacancy,
+    WorkPlace,
+    change_feedback_summary,
+    recount_feedback_summary,
+    update_mentor_availability,
+)
+
+
+def update_availability_on_save(sender, instance, **kwargs):
+    update_mentor_availability(
+        [instance.mentor_id, getattr(instance, "_loaded_mentor_id", None)]
+    )
+    instance._loaded_mentor_id = instance.mentor_id
+
+
+def update_availability_on_delete(sender, instance, **kwargs):
+    update_mentor_availability(
+        [instance.mentor_id, getattr(instance, "_loaded_mentor_id", None)]
+    )
+
+
+def _invalidate_feeds(direction_ids):
+    for direction_id in set(direction_ids) - {None}:
+        bump_version(Vacancy, direction_id)
+
+
+def invalidate_feed_on_save(sender, instance, **kwargs):
+    _invalidate_feeds(
+        [
+            instance.get_feed_direction_id(),
+            getattr(instance, "_loaded_feed_direction_id", None),
+        ]
+    )
+    instance._loaded_feed_direction_id = instance.get_feed_direction_id()
+
+
+def invalidate_feed_on_delete(sender, instance, **kwargs):
+    _invalidate_feeds(
+        [
+            instance.get_feed_direction_id(),
+            getattr(instance, "_loaded_feed_direction_id", None),
+        ]
+    )
+
+
+def invalidate_feed_on_qualifications_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        _invalidate_feeds([instance.get_feed_direction_id()])
+    elif pk_set:
+        _invalidate_feeds(
+            Vacancy.objects.filter(
+                pk__in=pk_set, status=Vacancy.Status.PUBLISHED
+            ).values_list("direction_id", flat=True)
+        )
+
+
+def forget_application_direction(sender, instance, **kwargs):
+    key = InternshipApplication.direction_cache_key(instance.applicant_id)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def forget_current_work_places(sender, instance, **kwargs):
+    users = {
+        (instance.trainee_id, User.Role.TRAINEE),
+        (instance.mentor_id, User.Role.MENTOR),
+        (getattr(instance, "_loaded_trainee_id", None), User.Role.TRAINEE),
+        (getattr(instance, "_loaded_mentor_id", None), User.Role.MENTOR),
+    }
+    keys = [WorkPlace.current_cache_key(pk, role) for pk, role in users if pk]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+    instance._loaded_trainee_id = instance.trainee_id
+
+
+def update_recommendation_on_profile_change(sender, instance, **kwargs):
+    InternshipApplication.objects.filter(
+        applicant_id=instance.user_id
+    ).update_recommendations()
+
+
+def update_recommendation_on_education_change(sender, instance, **kwargs):
+    InternshipApplication.objects.filter(
+        applicant_id=instance.profile_id
+    ).update_recommendations()
+
+
+def update_feedback_summary_on_save(sender, instance, created, **kwargs):
+    loaded = getattr(instance, "_loaded_rating", None)
+    if created:
+        change_feedback_summary(instance.to_user_id, 1, instance.rating)
+    elif loaded is None:
+        recount_feedback_summary([instance.to_user_id])
+    elif loaded[0] == instance.to_user_id:
+        change_feedback_summary(instance.to_user_id, 0, instance.rating - loaded[1])
+    else:
+        change_feedback_summary(loaded[0], -1, -loaded[1])
+        change_feedback_summary(instance.to_user_id, 1, instance.rating)
+    instance._loaded_rating = (instance.to_user_id, instance.rating)
+
+
+def update_feedback_summary_on_delete(sender, instance, **kwargs):
+    to_user_id, rating = getattr(
+        instance, "_loaded_rating", (instance.to_user_id, instance.rating)
+    )
+    change_feedback_summary(to_user_id, -1, -rating)
@@ -0,0 +1,129 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from internship.calendar import fold_line
+from internship.models import Event, WorkPlace
+
+
+@pytest.fixture
+def work_place(trainee, mentor, department):
+    return WorkPlace.objects.create(
+        name="Test", trainee=trainee, mentor=mentor, department=department
+    )
+
+
+@pytest.fixture
+def event(work_place):
+    return Event.objects.create(
+        name="Meeting, daily",
+        description="Bring notes;\nbe on time",
+        datetime=datetime.datetime(2023, 6, 1, 9, 30, tzinfo=datetime.timezone.utc),
+        workplace=work_place,
+    )
+
+
+def _content(response):
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_events_calendar(mentor_client, event, mentor):
+    url = reverse("events-calendar")
+    response = mentor_client.get(url, {"mentor": mentor.id})
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "text/calendar; charset=utf-8"
+    content = _content(response)
+    assert content.startswith("BEGIN:VCALENDAR\r\n")
+    assert content.endswith("END:VCALENDAR\r\n")
+    assert f"UID:event-{event.id}@testserver\r\n" in content
+    assert "DTSTART:20230601T093000Z\r\n" in content
+    assert "SUMMARY:Meeting\\, daily\r\n" in content
+    assert "DESCRIPTION:Bring notes\\;\\nbe on time\r\n" in content
+
+
+@pytest.mark.django_db
+def test_events_calendar_filtered(mentor_client, event, mentor, create_user):
+    event.workplace.mentor = create_user(username="other@user.com", role="M")
+    event.workplace.save()
+    response = mentor_client.get(reverse("events-calendar"), {"mentor": mentor.id})
+    assert "BEGIN:VEVENT" not in _content(response)
+
+
+@pytest.mark.django_db
+def test_events_calendar_etag(
+    mentor_client, event, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    url = reverse("events-calendar")
+    response = mentor_client.get(url)
+    etag = response["ETag"]
+
+    with django_assert_num_queries(0):
+        response = mentor_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    with django_capture_on_commit_callbacks(execute=True):
+        event.name = "Renamed"
+        event.save()
+    response = mentor_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert "SUMMARY:Renamed\r\n" in _content(response)
+
+
+@pytest.mark.django_db
+def test_events_calendar_etag_changes_with_user(
+    mentor_client, event, mentor, department2, django_capture_on_commit_callbacks
+):
+    url = reverse("events-calendar")
+    etag = mentor_client.get(url)["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        mentor.department = department2
+        mentor.save()
+    response = mentor_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_events_calendar_subscription(mentor_client, anon_api_client, event, mentor):
+    response = mentor_client.get(reverse("events-calendar-subscription"))
+    assert response.status_code == 200
+    url = response.data["url"]
+    assert url.startswith("http://testserver/")
+
+    response = anon_api_client.get(url)
+    assert response.status_code == 200
+    assert f"UID:event-{event.id}@testserver\r\n" in _content(response)
+
+    response = anon_api_client.get(reverse("events-calendar"), {"token": "bad"})
+    assert response.status_code == 403
+
+    mentor.is_active = False
+    mentor.save()
+    assert anon_api_client.get(url).status_code == 403
+
+
+@pytest.mark.django_db
+def test_fold_line():
+    line = "DESCRIPTION:" + "ж" * 100
+    folded = fold_line(line)
+    assert folded.endswith("\r\n")
+    parts = folded[:-2].split("\r\n")
+    assert all(len(part.encode()) <= 75 for part in parts)
+    assert all(part.startswith(" ") for part in parts[1:])
+    assert parts[0] + "".join(part[1:] for part in parts[1:]) == line
+
+
+@pytest.mark.django_db
+def test_events_range_uses_index(query_plan, work_place):
+    now = timezone.now()
+    queryset = Event.objects.filter(
+        workplace=work_place,
+        datetime__gte=now,
+        datetime__lte=now + datetime.timedelta(days=7),
+    )
+    assert "event_workplace_datetime_idx" in query_plan(queryset)
@@ -0,0 +1,117 @@
+import datetime
+
+import pytest
+from accounts.models import User
+from django.urls import reverse
+from internship.models import FeedBack, recount_feedback_summary
+
+
+@pytest.fixture
+def create_feedback(trainee, mentor):
+    def _create_feedback(rating, date, to_user=mentor):
+        return FeedBack.objects.create(
+            from_user=trainee, to_user=to_user, rating=rating, date=date, text=""
+        )
+
+    return _create_feedback
+
+
+def _summary(user):
+    user = User.objects.get(pk=user.pk)
+    return (
+        user.feedback_count,
+        user.feedback_rating_sum,
+        user.feedback_rating_average,
+        user.last_feedback_date,
+    )
+
+
+@pytest.mark.django_db
+def test_feedback_summary_maintained(create_feedback, mentor, create_user):
+    first = create_feedback(5, datetime.date(2023, 6, 1))
+    second = create_feedback(2, datetime.date(2023, 6, 3))
+    assert _summary(mentor) == (2, 7, 3.5, datetime.date(2023, 6, 3))
+
+    second = FeedBack.objects.get(pk=second.pk)
+    second.rating = 4
+    second.save()
+    assert _summary(mentor) == (2, 9, 4.5, datetime.date(2023, 6, 3))
+
+    other = create_user(username="other@user.com", role=User.Role.MENTOR)
+    second.to_user = other
+    second.save()
+    assert _summary(mentor) == (1, 5, 5, datetime.date(2023, 6, 1))
+    assert _summary(other) == (1, 4, 4, datetime.date(2023, 6, 3))
+
+    first.delete()
+    assert _summary(mentor) == (0, 0, None, None)
+
+
+@pytest.mark.django_db
+def test_feedback_summary_matches_recount(create_feedback, mentor):
+    feedbacks = [
+        create_feedback(i % 6, datetime.date(2023, 6, 1) + datetime.timedelta(days=i))
+        for i in range(10)
+    ]
+    for feedback in feedbacks[::3]:
+        feedback.delete()
+    incremental = _summary(mentor)
+
+    User.objects.filter(pk=mentor.pk).update(feedback_count=0, feedback_rating_sum=0)
+    recount_feedback_summary([mentor.pk])
+    assert _summary(mentor) == incremental
+
+
+@pytest.mark.django_db
+def test_user_save_keeps_feedback_summary(create_feedback, mentor):
+    create_feedback(4, datetime.date(2023, 6, 1))
+    mentor.first_name = "Jane"  # loaded before the feedback was counted
+    mentor.save()
+
+    assert _summary(mentor) == (1, 4, 4, datetime.date(2023, 6, 1))
+    assert User.objects.get(pk=mentor.pk).first_name == "Jane"
+
+
+@pytest.mark.django_db
+def test_get_feedback_summary(
+    api_client, create_feedback, mentor, django_assert_num_queries
+):
+    create_feedback(3, datetime.date(2023, 6, 1))
+    create_feedback(4, datetime.date(2023, 6, 2))
+    url = reverse("feedbacks-summary")
+
+    with django_assert_num_queries(1):
+        response = api_client.get(url, {"user": mentor.id})
+    assert response.status_code == 200
+    assert response.data == {
+        "user": mentor.id,
+        "count": 2,
+        "rating_sum": 7,
+        "average_rating": 3.5,
+        "last_date": "2023-06-02",
+    }
+
+    assert api_client.get(url).status_code == 400
+    assert api_client.get(url, {"user": 0}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_create_feedback_updates_summary(api_client, mentor):
+    url = reverse("feedbacks-list")
+    response = api_client.post(url, {"to_user": mentor.id, "rating": 4, "text": "ok"})
+    assert response.status_code == 201
+    assert _summary(mentor)[:3] == (1, 4, 4)
+
+
+@pytest.mark.django_db
+def test_users_with_feedback_summary(curator_client, create_feedback, mentor):
+    create_feedback(5, datetime.date(2023, 6, 1))
+    url = reverse("users-list")
+
+    response = curator_client.get(url)
+    assert "feedback_summary" not in response.data[0]
+
+    response = curator_client.get(url, {"with_feedback_summary": "true"})
+    data = next(user for user in response.data if user["id"] == mentor.id)
+    assert data["feedback_summary"]["count"] == 1
+    assert data["feedback_summary"]["average_rating"] == 5
@@ -26,6 +26,42 @@ def test_get_internship_applications(api_client, internship_application):
     assert data[0]["is_recommended"] is False
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize("count", [10, 100])
+def test_list_internship_applications_num_queries(
+    curator_client, create_applications, assert_list_num_queries, count
+):
+    url = reverse("internship-application-list")
+
+    # count, applications with applicants, profiles and status authors,
+    # links, educations, work experiences
+    results = assert_list_num_queries(
+        curator_client, url, create_applications, count, num_queries=5
+    )
+    assert all(
+        data["applicant"]["trainee_profile"]["educations"]
+        and data["applicant"]["trainee_profile"]["links"]
+        and data["applicant"]["trainee_profile"]["work_experiences"]
+        and data["status_changed_by"]["email"]
+        for data in results
+    )
+
+
+@pytest.mark.django_db
+def test_list_internship_applications_collapsed(
+    curator_client, create_applications, curator, django_assert_num_queries
+):
+    create_applications(10)
+    url = reverse("internship-application-list")
+
+    # count, applications without joins
+    with django_assert_num_queries(2):
+        response = curator_client.get(url, {"expand": ""})
+    data = response.data["results"][0]
+    assert isinstance(data["applicant"], int)
+    assert data["status_changed_by"] == curator.id
+
+
 @pytest.mark.django_db
 def test_get_internship_applications_with_filter(api_client, internship_application):
     url = reverse("internship-application-list")
@@ -139,3 +175,110 @@ def test_end_up_selection(curator_client, internship_application, trainee_profil
     internship_application.refresh_from_db()
     assert internship_application.status == InternshipApplication.Status.APPROVED
     assert internship_application.applicant.role == User.Role.TRAINEE
+
+
+@pytest.fixture
+def passed_candidates(create_user, direction):
+    candidates = []
+    for i, score in enumerate([50, 80, 80, 20]):
+        user = create_user(username=f"passed{i}@user.com")
+        TraineeProfile.objects.filter(user=user).update(
+            test_status=TraineeProfile.QualifyingStatus.PASSED,
+            cv_score=score,
+            test_score=0,
+        )
+        InternshipApplication.objects.create(applicant=user, direction=direction)
+        candidates.append(user)
+    return candidates
+
+
+@pytest.mark.django_db
+def test_end_up_selection_ranks_in_database(
+    curator_client,
+    curator,
+    passed_candidates,
+    settings,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    settings.SELECTION_COUNT = 2
+    url = reverse("internship-application-end-up-selection")
+    for user in passed_candidates:
+        User.objects.get_token_version(user.id)
+
+    # savepoint, lock, selection, release savepoint
+    with django_capture_on_commit_callbacks(execute=True):
+        with django_assert_num_queries(4):
+            response = curator_client.post(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {"count": 4, "approved": 2, "rejected": 2}
+    approved = set(
+        InternshipApplication.objects.filter(
+            status=InternshipApplication.Status.APPROVED
+        ).values_list("applicant_id", flat=True)
+    )
+    assert approved == {passed_candidates[1].id, passed_candidates[2].id}
+    assert (
+        set(User.objects.filter(role=User.Role.TRAINEE).values_list("id", flat=True))
+        == approved
+    )
+    assert set(
+        InternshipApplication.objects.values_list("status_changed_by", flat=True)
+    ) == {curator.id}
+    # Cached token versions of promoted users are forgotten
+    for user in passed_candidates:
+        expected = 1 if user.id in approved else 0
+        assert User.objects.get_token_version(user.id) == expected
+
+
+@pytest.mark.django_db
+def test_end_up_selection_rerun(curator_client, passed_candidates, settings):
+    settings.SELECTION_COUNT = 2
+    url = reverse("internship-application-end-up-selection")
+    curator_client.post(url)
+    before = list(
+        InternshipApplication.objects.order_by("pk").values_list(
+            "status", "status_changed_at"
+        )
+    )
+
+    response = curator_client.post(url)
+
+    assert response.data == {"count": 4, "approved": 2, "rejected": 2}
+    after = list(
+        InternshipApplication.objects.order_by("pk").values_list(
+            "status", "status_changed_at"
+        )
+    )
+    assert after == before
+    assert set(User.objects.values_list("token_version", flat=True)) == {0, 1}
+
+
+@pytest.mark.django_db
+def test_update_recommendations(
+    curator_client,
+    internship_application,
+    recommended_trainee_profile,
+    settings,
+    django_assert_num_queries,
+):
+    url = reverse("internship-application-update-recommendations")
+    settings.PREFERABLE_CITIZENSHIP_ID += 1
+
+    with django_assert_num_queries(1):
+        response = curator_client.post(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {"count": 1}
+    internship_application.refresh_from_db()
+    assert internship_application.is_recommended is False
+
+
+@pytest.mark.django_db
+def test_update_recommendations_forbidden(api_client, internship_application):
+    url = reverse("internship-application-update-recommendations")
+
+    response = api_client.post(url)
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,35 @@
+import pytest
+from django.urls import reverse
+from internship.models import Direction
+
+
+@pytest.mark.django_db
+def test_list_directions(
+    generic_api_client, direction, django_capture_on_commit_callbacks
+):
+    url = reverse("directions-list")
+    response = generic_api_client.get(url)
+    assert response.status_code == 200
+    assert response.json() == [{"id": direction.id, "name": direction.name}]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Direction.objects.create(name="New direction")
+
+    response = generic_api_client.get(url)
+    assert len(response.json()) == 2
+
+
+@pytest.mark.django_db
+def test_list_qualifications(
+    generic_api_client, qualification, django_capture_on_commit_callbacks
+):
+    url = reverse("qualifications-list")
+    response = generic_api_client.get(url)
+    assert response.status_code == 200
+    assert response.json() == [{"id": qualification.id, "name": qualification.name}]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        qualification.delete()
+
+    response = generic_api_client.get(url)
+    assert response.json() == []
@@ -1,6 +1,11 @@
 import pytest
+from django.contrib.postgres.search import SearchVector
+from django.db import connection
+from django.db.models import Value
 from django.urls import reverse
-from internship.models import TestTask, Vacancy
+from internship.filters import VacancyFilterSet
+from internship.models import Direction, Qualification, TestTask, Vacancy
+from internship.views import VacancyViewSet
 from rest_framework import status
 
 
@@ -12,25 +17,31 @@ def test_unauthorized_get_vacancies(anon_api_client, internship_application):
 
 
 @pytest.mark.django_db
-def test_get_vacancies(api_client, not_published_vacancy, internship_application):
+def test_get_vacancies(
+    api_client,
+    not_published_vacancy,
+    internship_application,
+    django_capture_on_commit_callbacks,
+):
     url = reverse("vacancies-list")
     response = api_client.get(url, {"status": Vacancy.Status.PUBLISHED})
     assert response.status_code == status.HTTP_200_OK
-    data = response.data["results"]
+    data = response.json()["results"]
     assert len(data) == 0
 
     response = api_client.get(url)
     assert response.status_code == status.HTTP_200_OK
-    data = response.data["results"]
+    data = response.json()["results"]
     assert len(data) == 0
 
     # publish vacancy
-    not_published_vacancy.status = Vacancy.Status.PUBLISHED
-    not_published_vacancy.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        not_published_vacancy.status = Vacancy.Status.PUBLISHED
+        not_published_vacancy.save()
 
     response = api_client.get(url)
     assert response.status_code == status.HTTP_200_OK
-    data = response.data["results"]
+    data = response.json()["results"]
     assert len(data) == 1
     assert data[0]["name"] == not_published_vacancy.name
     assert data[0]["description"] == not_published_vacancy.description
@@ -72,6 +83,47 @@ def test_create_vacancy(personnel_client, vacancy_data, direction, mentor, perso
     assert test_task.type == vacancy_data["test_task"]["type"]
 
 
+@pytest.mark.django_db
+def test_update_vacancy_reuses_qualifications(
+    curator_client, not_published_vacancy, qualification
+):
+    url = reverse("vacancies-detail", args=[not_published_vacancy.id])
+    names = [" qualification 1", "Python", "python", "SQL"]
+
+    response = curator_client.patch(
+        url, {"required_qualifications": names}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(
+        not_published_vacancy.required_qualifications.values_list("name", flat=True)
+    ) == ["Python", "Qualification 1", "SQL"]
+    assert Qualification.objects.count() == 3
+
+    response = curator_client.patch(
+        url, {"required_qualifications": ["PYTHON"]}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert list(
+        not_published_vacancy.required_qualifications.values_list("name", flat=True)
+    ) == ["Python"]
+    assert Qualification.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_resolve_qualifications_in_one_query(qualification, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        qualifications = Qualification.objects.resolve(
+            ["QUALIFICATION 1", "Python", "python"]
+        )
+
+    assert sorted((q.name, q.created) for q in qualifications) == [
+        ("Python", True),
+        ("Qualification 1", False),
+    ]
+
+
 @pytest.mark.django_db
 def test_publish_vacancy(
     curator_client,
@@ -105,3 +157,244 @@ def test_publish_vacancy(
     test_task = TestTask.objects.get(title=vacancy_data["test_task"]["title"])
     assert test_task.description == vacancy_data["test_task"]["description"]
     assert test_task.type == vacancy_data["test_task"]["type"]
+
+
+@pytest.mark.django_db
+def test_vacancies_trainee_scope_uses_index(
+    query_plan, trainee, internship_application
+):
+    queryset = VacancyViewSet(action="list").scope_queryset(
+        Vacancy.objects.all(), trainee
+    )
+    plan = query_plan(queryset)
+    assert "vacancy_published_idx" in plan
+    assert "Seq Scan" not in plan
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("count", [10, 1000])
+def test_list_vacancies_num_queries(
+    curator_client, create_vacancies, assert_list_num_queries, count
+):
+    url = reverse("vacancies-list")
+
+    # count, vacancies with all single-valued relations, qualifications
+    results = assert_list_num_queries(
+        curator_client, url, create_vacancies, count, num_queries=3
+    )
+    assert all(
+        data["mentor"]["department"]["id"] and data["required_qualifications"]
+        for data in results
+    )
+
+
+@pytest.mark.django_db
+def test_list_vacancies_sparse_fields(
+    curator_client, create_vacancies, mentor, django_assert_num_queries
+):
+    create_vacancies(10)
+    url = reverse("vacancies-list")
+
+    # count, vacancies without joins
+    with django_assert_num_queries(2):
+        response = curator_client.get(url, {"fields": "id,name,mentor"})
+    data = response.data["results"][0]
+    assert data.keys() == {"id", "name", "mentor"}
+    assert data["mentor"] == mentor.id
+
+
+@pytest.mark.django_db
+def test_list_vacancies_expand(
+    curator_client, create_vacancies, mentor, qualification, django_assert_num_queries
+):
+    create_vacancies(10)
+    url = reverse("vacancies-list")
+    query = {
+        "fields": "id,mentor.email,mentor.department,required_qualifications",
+        "expand": "mentor.department",
+    }
+
+    # count, vacancies with mentors and their departments, qualifications
+    with django_assert_num_queries(3):
+        response = curator_client.get(url, query)
+    data = response.data["results"][0]
+    assert data["mentor"] == {
+        "email": mentor.email,
+        "department": {"id": mentor.department_id, "name": mentor.department.name},
+    }
+    assert data["required_qualifications"] == [qualification.id]
+
+
+@pytest.mark.django_db
+def test_list_vacancies_expand_keeps_all_fields(curator_client, create_vacancies):
+    create_vacancies(1)
+    url = reverse("vacancies-list")
+    full = curator_client.get(url).data["results"][0]
+
+    response = curator_client.get(url, {"expand": "direction"})
+    data = response.data["results"][0]
+    assert data.keys() == full.keys()
+    assert data["direction"] == full["direction"]
+    assert data["owner"] == full["owner"]["id"]
+
+
+@pytest.mark.django_db
+def test_retrieve_vacancy_num_queries(
+    curator_client, create_vacancies, django_assert_num_queries
+):
+    vacancy = create_vacancies(1)[0]
+    url = reverse("vacancies-detail", kwargs={"pk": vacancy.pk})
+
+    with django_assert_num_queries(2):
+        response = curator_client.get(url)
+    assert response.data["test_task"]["id"] == vacancy.test_task_id
+
+
+@pytest.fixture
+def search_vacancies(create_vacancies):
+    backend, frontend, analyst = create_vacancies(3)
+    backend.name = "Python разработчик"
+    backend.description = "Разработка сервисов на Django"
+    backend.save()
+    frontend.name = "Frontend developer"
+    frontend.description = "React and TypeScript, some Python scripting"
+    frontend.save()
+    analyst.name = "Аналитик"
+    analyst.description = "Анализ требований"
+    analyst.save()
+    analyst.required_qualifications.set(Qualification.objects.resolve(["SQL"]))
+    return backend, frontend, analyst
+
+
+@pytest.mark.django_db
+def test_search_vacancies(curator_client, search_vacancies):
+    backend, frontend, analyst = search_vacancies
+    url = reverse("vacancies-list")
+
+    response = curator_client.get(url, {"search": "python"})
+    assert [data["id"] for data in response.data["results"]] == [
+        backend.id,
+        frontend.id,
+    ]
+
+    response = curator_client.get(url, {"search": "developers"})
+    assert [data["id"] for data in response.data["results"]] == [frontend.id]
+
+    response = curator_client.get(url, {"search": "sql"})
+    assert [data["id"] for data in response.data["results"]] == [analyst.id]
+
+
+@pytest.mark.django_db
+def test_search_vacancies_russian(curator_client, search_vacancies):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_tsvector('russian', 'разработчик') <> ''")
+        if not cursor.fetchone()[0]:
+            pytest.skip("Database locale does not treat Cyrillic as letters")
+    backend, frontend, analyst = search_vacancies
+    url = reverse("vacancies-list")
+
+    response = curator_client.get(url, {"search": "разработчики"})
+    assert [data["id"] for data in response.data["results"]] == [backend.id]
+
+
+@pytest.mark.django_db
+def test_search_vector_follows_qualifications(curator_client, search_vacancies):
+    backend, frontend, analyst = search_vacancies
+    url = reverse("vacancies-list")
+
+    Qualification.objects.filter(name="SQL").update(name="PostgreSQL")
+    response = curator_client.get(url, {"search": "postgresql"})
+    assert [data["id"] for data in response.data["results"]] == [analyst.id]
+
+    analyst.required_qualifications.clear()
+    response = curator_client.get(url, {"search": "postgresql"})
+    assert response.data["results"] == []
+
+
+@pytest.mark.django_db
+def test_search_vacancies_uses_index(query_plan, search_vacancies):
+    queryset = VacancyFilterSet({"search": "python"}, queryset=Vacancy.objects.all()).qs
+    assert "vacancy_search_idx" in query_plan(queryset)
+
+
+@pytest.mark.django_db
+def test_trainee_vacancy_feed_is_cached(
+    api_client,
+    not_published_vacancy,
+    internship_application,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    url = reverse("vacancies-list")
+    vacancy = Vacancy.objects.get(pk=not_published_vacancy.pk)
+    with django_capture_on_commit_callbacks(execute=True):
+        vacancy.status = Vacancy.Status.PUBLISHED
+        vacancy.save()
+
+    response = api_client.get(url)
+    assert [data["id"] for data in response.json()["results"]] == [vacancy.id]
+
+    with django_assert_num_queries(0):
+        cached_response = api_client.get(url)
+    assert cached_response.content == response.content
+
+    with django_capture_on_commit_callbacks(execute=True):
+        vacancy.status = Vacancy.Status.CLOSED
+        vacancy.save()
+    response = api_client.get(url)
+    assert response.json()["results"] == []
+
+
+@pytest.mark.django_db
+def test_trainee_vacancy_feed_negotiates_content(
+    api_client, published_vacancy, internship_application
+):
+    url = reverse("vacancies-list")
+    api_client.get(url)
+
+    response = api_client.get(url, HTTP_ACCEPT="text/html")
+    assert response["Content-Type"].startswith("text/html")
+    assert published_vacancy.name in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_trainee_vacancy_feed_follows_direction_changes(
+    api_client,
+    not_published_vacancy,
+    internship_application,
+    django_capture_on_commit_callbacks,
+):
+    url = reverse("vacancies-list")
+    vacancy = Vacancy.objects.get(pk=not_published_vacancy.pk)
+    with django_capture_on_commit_callbacks(execute=True):
+        vacancy.status = Vacancy.Status.PUBLISHED
+        vacancy.save()
+    assert len(api_client.get(url).json()["results"]) == 1
+
+    other_direction = Direction.objects.create(name="Other direction")
+    with django_capture_on_commit_callbacks(execute=True):
+        vacancy.direction = other_direction
+        vacancy.save()
+    assert api_client.get(url).json()["results"] == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        internship_application.direction = other_direction
+        internship_application.save()
+    assert len(api_client.get(url).json()["results"]) == 1
+
+
+@pytest.mark.django_db
+def test_search_vector_kept_on_unrelated_updates(search_vacancies):
+    backend = search_vacancies[0]
+    vacancies = Vacancy.objects.filter(pk=backend.pk)
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL session_replication_role = replica")
+        vacancies.update(search_vector=SearchVector(Value("stale")))
+        cursor.execute("SET LOCAL session_replication_role = DEFAULT")
+
+    vacancies.update(status=Vacancy.Status.CLOSED)
+    assert vacancies.filter(search_vector="stale").exists()
+
+    vacancies.update(name="Python developer")
+    assert not vacancies.filter(search_vector="stale").exists()
+    assert vacancies.filter(search_vector="python").exists()
@@ -1,7 +1,17 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+from django.db import OperationalError, connection
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from internship.models import Vacancy, VacancyResponse, WorkPlace
+from internship.views import VacancyResponseViewSet
 from rest_framework import status
+from rest_framework.test import APIClient
+
+APPROVERS = 8
 
 
 @pytest.mark.django_db
@@ -48,6 +58,63 @@ def test_get_vacancy_responses(
     assert len(data) == 0
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize("client", ["mentor_client", "personnel_client"])
+@pytest.mark.parametrize("count", [10, 100])
+def test_list_vacancy_responses_num_queries(
+    request, create_vacancy_responses, assert_list_num_queries, client, count
+):
+    url = reverse("vacancy-responses-list")
+    client = request.getfixturevalue(client)
+
+    # count, responses with vacancies and applicants with all single-valued
+    # relations, qualifications, links, educations, work experiences
+    results = assert_list_num_queries(
+        client, url, create_vacancy_responses, count, num_queries=6
+    )
+    assert all(
+        data["vacancy"]["reviewed_by"]["email"]
+        and data["vacancy"]["mentor"]["department"]["id"]
+        and data["vacancy"]["required_qualifications"]
+        and data["applicant"]["educations"]
+        and data["applicant"]["email"]
+        for data in results
+    )
+
+
+@pytest.mark.django_db
+def test_list_vacancy_responses_sparse_fields(
+    mentor_client, create_vacancy_responses, django_assert_num_queries
+):
+    create_vacancy_responses(10)
+    url = reverse("vacancy-responses-list")
+    query = {
+        "fields": "id,vacancy.name,applicant.email,applicant.educations",
+        "expand": "vacancy,applicant",
+    }
+
+    # count, responses with vacancies and applicants, educations
+    with django_assert_num_queries(3):
+        response = mentor_client.get(url, query)
+    data = response.data["results"][0]
+    assert data.keys() == {"id", "vacancy", "applicant"}
+    assert data["vacancy"] == {"name": "Test vacancy"}
+    assert data["applicant"].keys() == {"email", "educations"}
+    assert len(data["applicant"]["educations"]) == 1
+
+
+@pytest.mark.django_db
+def test_retrieve_vacancy_response_num_queries(
+    mentor_client, create_vacancy_responses, django_assert_num_queries
+):
+    (vacancy_response,) = create_vacancy_responses(1)
+    url = reverse("vacancy-responses-detail", args=[vacancy_response.id])
+
+    with django_assert_num_queries(5):
+        response = mentor_client.get(url)
+    assert response.data["applicant"]["work_experiences"]
+
+
 @pytest.mark.django_db
 def test_create_vacancy_response(api_client, trainee, published_vacancy):
     url = reverse("vacancy-responses-list")
@@ -145,3 +212,101 @@ def test_get_vacancy_response_approve(curator_client, vacancy_response):
     assert work_place.trainee == vacancy_response.applicant.user
     assert work_place.mentor == vacancy.mentor
     assert vacancy.status == Vacancy.Status.CLOSED
+
+
+@pytest.mark.django_db
+def test_approve_vacancy_response_updates_only_status(curator_client, vacancy_response):
+    url = reverse("vacancy-responses-approve", args=[vacancy_response.id])
+    with CaptureQueriesContext(connection) as queries:
+        response = curator_client.post(url)
+    assert response.status_code == status.HTTP_201_CREATED
+    (update,) = [
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith('UPDATE "internship_vacancy"')
+    ]
+    assert update.startswith('UPDATE "internship_vacancy" SET "status" = ')
+
+
+@pytest.mark.django_db
+def test_approve_vacancy_response_closed_vacancy(
+    curator_client, vacancy_response, create_user, trainee_profile
+):
+    other = VacancyResponse.objects.create(
+        vacancy=vacancy_response.vacancy,
+        applicant=create_user(username="other@user.com").trainee_profile,
+        text_answer="Answer",
+    )
+    url = reverse("vacancy-responses-approve", args=[vacancy_response.id])
+    assert curator_client.post(url).status_code == status.HTTP_201_CREATED
+
+    url = reverse("vacancy-responses-approve", args=[other.id])
+    response = curator_client.post(url)
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert WorkPlace.objects.get().trainee_id == trainee_profile.user_id
+
+
+@pytest.mark.django_db
+def test_approve_vacancy_response_database_error(vacancy_response, monkeypatch):
+    def lose_connection(*args, **kwargs):
+        raise OperationalError("server closed the connection unexpectedly")
+
+    monkeypatch.setattr(QuerySet, "get", lose_connection)
+    with pytest.raises(OperationalError):
+        vacancy_response.approve()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_approve_vacancy_response_concurrently(curator, published_vacancy, create_user):
+    responses = [
+        VacancyResponse.objects.create(
+            vacancy=published_vacancy,
+            applicant=create_user(username=f"applicant{i}@user.com").trainee_profile,
+            text_answer="Answer",
+        )
+        for i in range(APPROVERS)
+    ]
+    barrier = threading.Barrier(APPROVERS)
+
+    def approve(vacancy_response):
+        client = APIClient()
+        client.force_authenticate(curator)
+        url = reverse("vacancy-responses-approve", args=[vacancy_response.id])
+        try:
+            barrier.wait()
+            return client.post(url).status_code
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(APPROVERS) as executor:
+        codes = list(executor.map(approve, responses))
+
+    assert sorted(codes) == [status.HTTP_201_CREATED] + [status.HTTP_409_CONFLICT] * (
+        APPROVERS - 1
+    )
+    work_place = WorkPlace.objects.get()
+    assert work_place.vacancy_id == published_vacancy.id
+    published_vacancy.refresh_from_db()
+    assert published_vacancy.status == Vacancy.Status.CLOSED
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "role,index",
+    [
+        ("personnel", "internship_vacancy_department_id"),
+        ("mentor", "vacancy_mentor_status_idx"),
+        ("trainee", "vacancy_response_applicant_idx"),
+    ],
+)
+def test_vacancy_responses_scope_uses_indexes(
+    request, query_plan, create_other_vacancy_responses, role, index
+):
+    user = request.getfixturevalue(role)
+    create_other_vacancy_responses(500)
+    queryset = VacancyResponseViewSet(action="list").scope_queryset(
+        VacancyResponse.objects.all(), user
+    )
+    plan = query_plan(queryset)
+    assert index in plan
+    assert "Seq Scan" not in plan
@@ -0,0 +1,251 @@
+import datetime
+
+import pytest
+from accounts.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from internship.models import Event, FeedBack, WorkPlace
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "lookup,fixture,index",
+    [
+        ("department", "department", "work_place_department_idx"),
+        ("mentor", "mentor", "work_place_mentor_idx"),
+        ("trainee", "trainee", "attendance_work_place_trainee_id"),
+    ],
+)
+def test_work_places_filters_use_indexes(
+    request, query_plan, create_other_work_places, lookup, fixture, index
+):
+    value = request.getfixturevalue(fixture)
+    create_other_work_places(100)
+    plan = query_plan(WorkPlace.objects.filter(**{lookup: value}))
+    assert index in plan
+    assert "Seq Scan" not in plan
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "lookup,fixture,index",
+    [
+        ("workplace__mentor", "mentor", "work_place_mentor_idx"),
+        ("workplace__trainee", "trainee", "attendance_work_place_trainee_id"),
+    ],
+)
+def test_events_filters_use_indexes(
+    request, query_plan, create_other_work_places, lookup, fixture, index
+):
+    value = request.getfixturevalue(fixture)
+    now = timezone.now()
+    Event.objects.bulk_create(
+        Event(
+            name="Meeting",
+            description="",
+            workplace=work_place,
+            datetime=now + datetime.timedelta(days=day),
+        )
+        for work_place in create_other_work_places(100)
+        for day in range(5)
+    )
+    plan = query_plan(Event.objects.filter(**{lookup: value}))
+    assert index in plan
+    assert "Seq Scan" not in plan
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("role", ["curator", "personnel", "mentor", "trainee"])
+def test_work_places_and_events_visible_to_staff_roles(
+    request, anon_api_client, create_other_work_places, role
+):
+    work_place = create_other_work_places(1)[0]
+    event = Event.objects.create(
+        name="Meeting", description="", workplace=work_place, datetime=timezone.now()
+    )
+    anon_api_client.force_authenticate(request.getfixturevalue(role))
+
+    response = anon_api_client.get(reverse("work-places-list"))
+    assert [data["id"] for data in response.data["results"]] == [work_place.id]
+    response = anon_api_client.get(reverse("events-list"))
+    assert [data["id"] for data in response.data["results"]] == [event.id]
+
+
+@pytest.mark.django_db
+def test_work_places_and_events_forbidden_to_candidates(candidate_client):
+    assert candidate_client.get(reverse("work-places-list")).status_code == 403
+    assert candidate_client.get(reverse("events-list")).status_code == 403
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "queryset,index",
+    [
+        (lambda: Event.objects.order_by("-datetime", "-id"), "event_datetime_idx"),
+        (lambda: FeedBack.objects.order_by("-date", "-id"), "feedback_date_idx"),
+    ],
+)
+def test_pages_use_indexes(query_plan, queryset, index):
+    plan = query_plan(queryset()[:100])
+    assert index in plan
+
+
+@pytest.mark.django_db
+def test_get_events_pages(mentor_client, trainee, mentor, department):
+    work_place = WorkPlace.objects.create(
+        name="Test", trainee=trainee, mentor=mentor, department=department
+    )
+    now = timezone.now()
+    events = [
+        Event.objects.create(
+            name=f"Event {i}",
+            description="",
+            datetime=now - datetime.timedelta(hours=i),
+            workplace=work_place,
+        )
+        for i in range(5)
+    ]
+    url = f"{reverse('events-list')}?limit=2"
+
+    ids = []
+    while url:
+        response = mentor_client.get(url)
+        assert response.status_code == 200
+        ids += [data["id"] for data in response.data["results"]]
+        url = response.data["next"]
+    assert ids == [event.id for event in events]
+
+
+@pytest.mark.django_db
+def test_current_work_place_is_cached(
+    trainee,
+    mentor,
+    department,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    assert WorkPlace.objects.get_current_id(trainee.id, User.Role.TRAINEE) is None
+
+    with django_capture_on_commit_callbacks(execute=True):
+        work_place = WorkPlace.objects.create(
+            name="Test", trainee=trainee, mentor=mentor, department=department
+        )
+    assert WorkPlace.objects.get_current_id(trainee.id, User.Role.TRAINEE) == (
+        work_place.id
+    )
+    assert WorkPlace.objects.get_current_id(mentor.id, User.Role.MENTOR) == (
+        work_place.id
+    )
+    with django_assert_num_queries(0):
+        assert WorkPlace.objects.get_current_id(trainee.id, User.Role.TRAINEE) == (
+            work_place.id
+        )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        work_place.is_active = False
+        work_place.save()
+    assert cache.get(WorkPlace.current_cache_key(trainee.id, User.Role.TRAINEE)) is None
+    assert WorkPlace.objects.get_current_id(trainee.id, User.Role.TRAINEE) is None
+    assert WorkPlace.objects.get_current_id(mentor.id, User.Role.MENTOR) is None
+
+
+@pytest.mark.django_db
+def test_current_work_place_forgotten_for_previous_mentor(
+    trainee, mentor, create_user, department, django_capture_on_commit_callbacks
+):
+    work_place = WorkPlace.objects.create(
+        name="Test", trainee=trainee, mentor=mentor, department=department
+    )
+    assert WorkPlace.objects.get_current_id(mentor.id, User.Role.MENTOR) == (
+        work_place.id
+    )
+
+    work_place = WorkPlace.objects.get(pk=work_place.pk)
+    work_place.mentor = create_user(username="other@user.com", role=User.Role.MENTOR)
+    with django_capture_on_commit_callbacks(execute=True):
+        work_place.save()
+    assert WorkPlace.objects.get_current_id(mentor.id, User.Role.MENTOR) is None
+
+
+@pytest.mark.django_db
+def test_current_work_place_forgotten_for_previous_trainee(
+    trainee, mentor, create_user, department, django_capture_on_commit_callbacks
+):
+    work_place = WorkPlace.objects.create(
+        name="Test", trainee=trainee, mentor=mentor, department=department
+    )
+    assert WorkPlace.objects.get_current_id(trainee.id, User.Role.TRAINEE) == (
+        work_place.id
+    )
+
+    work_place = WorkPlace.objects.get(pk=work_place.pk)
+    work_place.trainee = create_user(username="other@user.com", role=User.Role.TRAINEE)
+    with django_capture_on_commit_callbacks(execute=True):
+        work_place.save()
+    assert WorkPlace.objects.get_current_id(trainee.id, User.Role.TRAINEE) is None
+    assert WorkPlace.objects.get_current_id(
+        work_place.trainee_id, User.Role.TRAINEE
+    ) == (work_place.id)
+
+
+@pytest.mark.django_db
+def test_work_place_by_trainee_with_mentor_id(api_client, trainee, mentor, department):
+    WorkPlace.objects.create(
+        name="Test", trainee=trainee, mentor=mentor, department=department
+    )
+    assert WorkPlace.objects.get_current_id(mentor.id, User.Role.MENTOR) is not None
+
+    url = reverse("work-places-by-trainee", args=[mentor.id])
+    response = api_client.get(url)
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_current_trainee_work_place_uses_partial_index(
+    query_plan, create_other_work_places, trainee
+):
+    create_other_work_places(100)
+    queryset = WorkPlace.objects.filter(trainee_id=trainee.id, is_active=True)
+    assert "work_place_active_trainee_idx" in query_plan(queryset)
+
+
+@pytest.mark.django_db
+def test_get_current_work_place(
+    api_client, mentor_client, trainee, create_user, department
+):
+    url = reverse("work-places-current")
+    response = mentor_client.get(url)
+    assert response.status_code == 404
+
+    mentor = create_user(username="other@user.com", role=User.Role.MENTOR)
+    work_place = WorkPlace.objects.create(
+        name="Test", trainee=trainee, mentor=mentor, department=department
+    )
+    response = api_client.get(url)
+    assert response.status_code == 200
+    assert response.data["id"] == work_place.id
+    assert response.data["mentor"]["id"] == mentor.id
+
+    url = reverse("work-places-by-trainee", args=[trainee.id])
+    response = api_client.get(url)
+    assert response.data["id"] == work_place.id
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("count", [10, 1000])
+def test_list_work_places_num_queries(
+    personnel_client, create_work_places, qualification, assert_list_num_queries, count
+):
+    url = reverse("work-places-list")
+
+    # work places with all single-valued relations, qualifications
+    results = assert_list_num_queries(
+        personnel_client, url, create_work_places, count, num_queries=2
+    )
+    assert all(
+        data["vacancy"]["required_qualifications"] == [qualification.name]
+        and data["vacancy"]["test_task"]["id"]
+        and data["mentor"]["department"]["id"]
+        for data in results
+    )
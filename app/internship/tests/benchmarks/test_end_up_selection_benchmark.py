@@ -0,0 +1,52 @@
+import time
+
+import pytest
+from accounts.models import TraineeProfile, User
+from django.contrib.auth.hashers import make_password
+from internship.models import InternshipApplication
+
+CANDIDATES = 100_000
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_end_up_selection_duration(curator, direction, settings):
+    password = make_password(None)
+    users = User.objects.bulk_create(
+        (
+            User(
+                username=f"candidate{i}@user.com",
+                password=password,
+                role=User.Role.CANDIDATE,
+            )
+            for i in range(CANDIDATES)
+        ),
+        batch_size=5000,
+    )
+    TraineeProfile.objects.bulk_create(
+        (
+            TraineeProfile(
+                user=user,
+                test_status=TraineeProfile.QualifyingStatus.PASSED,
+                cv_score=i % 97,
+                test_score=i % 89,
+            )
+            for i, user in enumerate(users)
+        ),
+        batch_size=5000,
+    )
+    InternshipApplication.objects.bulk_create(
+        (InternshipApplication(applicant=user, direction=direction) for user in users),
+        batch_size=5000,
+    )
+
+    start = time.perf_counter()
+    result = InternshipApplication.objects.end_up_selection(
+        settings.SELECTION_COUNT, changed_by_id=curator.id
+    )
+    duration = time.perf_counter() - start
+
+    print(f"\nSelection over {CANDIDATES} candidates: {duration:.2f} s")
+    assert result["count"] == CANDIDATES
+    assert result["approved"] == settings.SELECTION_COUNT
+    assert duration < 10
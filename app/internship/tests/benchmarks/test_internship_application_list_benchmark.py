@@ -0,0 +1,39 @@
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+APPLICATIONS = 5_000
+PAGE_SIZE = 100
+REQUESTS = 5
+
+
+def _page_latency(client, url, offset):
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, {"limit": PAGE_SIZE, "offset": offset})
+        assert len(response.data["results"]) == PAGE_SIZE
+    return (time.perf_counter() - start) / REQUESTS * 1000, len(queries)
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_internship_application_list_latency(curator_client, create_applications):
+    create_applications(APPLICATIONS)
+    url = reverse("internship-application-list")
+
+    first_latency, first_queries = _page_latency(curator_client, url, 0)
+    last_latency, last_queries = _page_latency(
+        curator_client, url, APPLICATIONS - PAGE_SIZE
+    )
+
+    print(
+        f"\nApplications page over {APPLICATIONS}: first {first_latency:.1f} ms, "
+        f"last {last_latency:.1f} ms"
+    )
+    assert first_queries == last_queries == 5
+    assert last_latency < 500
+    assert last_latency < first_latency * 2
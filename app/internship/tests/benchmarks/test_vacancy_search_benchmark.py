@@ -0,0 +1,42 @@
+import time
+
+import pytest
+from django.urls import reverse
+from internship.models import Vacancy
+
+VACANCIES = 10_000
+SEARCHES = 20
+WORDS = ["python", "django", "react", "analytics", "devops", "testing", "design"]
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_vacancy_search_latency(
+    curator_client, mentor, personnel, direction, department, test_task
+):
+    Vacancy.objects.bulk_create(
+        (
+            Vacancy(
+                name=f"{WORDS[i % len(WORDS)]} engineer {i}",
+                description=f"Work with {WORDS[i * 3 % len(WORDS)]} every day",
+                status=Vacancy.Status.PUBLISHED,
+                mentor=mentor,
+                owner=personnel,
+                direction=direction,
+                department=department,
+                test_task=test_task,
+            )
+            for i in range(VACANCIES)
+        ),
+        batch_size=1000,
+    )
+    url = reverse("vacancies-list")
+
+    start = time.perf_counter()
+    for i in range(SEARCHES):
+        response = curator_client.get(url, {"search": "django", "limit": 20})
+        assert response.data["count"] > 0
+    latency = (time.perf_counter() - start) / SEARCHES * 1000
+
+    print(f"\nSearch over {VACANCIES} vacancies: {latency:.1f} ms per request")
+    assert latency < 100
@@ -0,0 +1,16 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+def test_update_recommendations(
+    internship_application, recommended_trainee_profile, settings, capsys
+):
+    assert internship_application.is_recommended is True
+    settings.REQUIRED_UNIVERSITY_YEARS += 1
+
+    call_command("updaterecommendations")
+
+    internship_application.refresh_from_db()
+    assert internship_application.is_recommended is False
+    assert "Updated 1 applications" in capsys.readouterr().out
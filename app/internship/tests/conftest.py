@@ -1,10 +1,14 @@
 import pytest
+from accounts.models import Education
+from django.conf import settings
+from django.utils import timezone
 from internship.models import (
     InternshipApplication,
     Qualification,
     TestTask,
     Vacancy,
     VacancyResponse,
+    WorkPlace,
 )
 
 
@@ -82,3 +86,104 @@ def vacancy_response(published_vacancy, trainee, trainee_profile):
     return VacancyResponse.objects.create(
         vacancy=published_vacancy, applicant=trainee_profile, text_answer="Answer"
     )
+
+
+@pytest.fixture
+def recommended_trainee_profile(internship_application, user):
+    education = Education.objects.create(
+        profile=internship_application.applicant.trainee_profile,
+        start_year=timezone.now().date().year
+        - settings.REQUIRED_UNIVERSITY_YEARS,  # Required years ago
+        type=Education.Type.UNIVERSITY,
+        degree=Education.DegreeType.BACHELOR,
+    )
+    user.trainee_profile.educations.add(education)
+    user.trainee_profile.citizenship_id = settings.PREFERABLE_CITIZENSHIP_ID
+    user.trainee_profile.save()
+    internship_application.set_recommendation()  # for recommendation calculation
+    return user.trainee_profile
+
+
+@pytest.fixture
+def create_applications(create_filled_profiles, direction, curator):
+    def _create_applications(count):
+        return InternshipApplication.objects.bulk_create(
+            (
+                InternshipApplication(
+                    applicant_id=profile.user_id,
+                    direction=direction,
+                    status_changed_by=curator,
+                    status_changed_at=timezone.now(),
+                )
+                for profile in create_filled_profiles(count)
+            ),
+            batch_size=5000,
+        )
+
+    return _create_applications
+
+
+@pytest.fixture
+def create_vacancy_responses(create_applications, published_vacancy, curator):
+    published_vacancy.reviewed_by = curator
+    published_vacancy.save()
+
+    def _create_vacancy_responses(count):
+        return VacancyResponse.objects.bulk_create(
+            VacancyResponse(
+                vacancy=published_vacancy,
+                applicant_id=application.applicant_id,
+                text_answer="Answer",
+            )
+            for application in create_applications(count)
+        )
+
+    return _create_vacancy_responses
+
+
+@pytest.fixture
+def create_vacancies(
+    qualification, curator, mentor, personnel, direction, department, test_task
+):
+    def _create_vacancies(count, status=Vacancy.Status.PUBLISHED):
+        vacancies = Vacancy.objects.bulk_create(
+            Vacancy(
+                name=f"Vacancy {i}",
+                description="Test description",
+                status=status,
+                mentor=mentor,
+                owner=personnel,
+                reviewed_by=curator,
+                direction=direction,
+                department=department,
+                test_task=test_task,
+            )
+            for i in range(count)
+        )
+        Vacancy.required_qualifications.through.objects.bulk_create(
+            Vacancy.required_qualifications.through(
+                vacancy=vacancy, qualification=qualification
+            )
+            for vacancy in vacancies
+        )
+        return vacancies
+
+    return _create_vacancies
+
+
+@pytest.fixture
+def create_work_places(create_vacancies, create_applications, mentor, department):
+    def _create_work_places(count):
+        vacancies = create_vacancies(count, status=Vacancy.Status.CLOSED)
+        return WorkPlace.objects.bulk_create(
+            WorkPlace(
+                name=vacancy.name,
+                vacancy=vacancy,
+                trainee_id=application.applicant_id,
+                mentor=mentor,
+                department=department,
+            )
+            for vacancy, application in zip(vacancies, create_applications(count))
+        )
+
+    return _create_work_places
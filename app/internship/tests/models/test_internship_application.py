@@ -1,5 +1,5 @@
 import pytest
-from accounts.models import Country
+from accounts.models import Country, Education
 from django.conf import settings
 
 
@@ -30,3 +30,34 @@ def test_is_recommended_without_required_university_years(
     education.save()
     internship_application.set_recommendation()  # for recommendation calculation
     assert internship_application.is_recommended is False
+
+
+@pytest.mark.django_db
+def test_is_recommended_follows_education_changes(
+    internship_application, recommended_trainee_profile
+):
+    education = recommended_trainee_profile.educations.get()
+    education.degree = Education.DegreeType.MASTER
+    education.save()
+    internship_application.refresh_from_db()
+    assert internship_application.is_recommended is False
+
+    education.delete()
+    Education.objects.create(
+        profile=recommended_trainee_profile,
+        start_year=2000,
+        type=Education.Type.UNIVERSITY,
+        degree=Education.DegreeType.BACHELOR,
+    )
+    internship_application.refresh_from_db()
+    assert internship_application.is_recommended is True
+
+
+@pytest.mark.django_db
+def test_is_recommended_follows_citizenship_changes(
+    internship_application, recommended_trainee_profile, non_preferable_country
+):
+    recommended_trainee_profile.citizenship = non_preferable_country
+    recommended_trainee_profile.save()
+    internship_application.refresh_from_db()
+    assert internship_application.is_recommended is False
@@ -1,8 +1,10 @@
 from django.urls import include, path
 from internship.views import (
+    DirectionViewSet,
     EventViewSet,
     FeedBackViewSet,
     InternshipApplicationViewSet,
+    QualificationViewSet,
     VacancyResponseViewSet,
     VacancyViewSet,
     WorkPlaceViewSet,
@@ -15,6 +17,8 @@ router.register(
     InternshipApplicationViewSet,
     basename="internship-application",
 )
+router.register(r"directions", DirectionViewSet, basename="directions")
+router.register(r"qualifications", QualificationViewSet, basename="qualifications")
 router.register(r"vacancies", VacancyViewSet, basename="vacancies")
 router.register(
     r"vacancy-response", VacancyResponseViewSet, basename="vacancy-responses"
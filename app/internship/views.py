@@ -1,4 +1,12 @@
-from accounts.models import TraineeProfile, User
+import hashlib
+from urllib.parse import urlencode
+
+from accounts.authentication import (
+    CALENDAR_TOKEN_PARAM,
+    CalendarTokenAuthentication,
+    make_calendar_token,
+)
+from accounts.models import User
 from accounts.permissions import (
     IsCandidate,
     IsCurator,
@@ -6,42 +14,61 @@ from accounts.permissions import (
     IsPersonnel,
     IsTrainee,
 )
+from accounts.serializers import FeedbackSummarySerializer
+from backend.cache import VersionedCacheMixin, get_version, get_versions
+from backend.eager_loading import EagerLoadingMixin, eager_load
+from backend.pagination import KeysetPagination
+from backend.scoping import ScopedQuerysetMixin, all_rows, user_lookups
 from django.conf import settings
-from django.db import transaction
-from django.http import Http404
+from django.core.cache import cache
+from django.db.models import Q
+from django.http import Http404, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import extend_schema
-from internship.filters import EventFilterSet
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from internship.calendar import iter_calendar
+from internship.filters import EventFilterSet, VacancyFilterSet
 from internship.models import (
+    Direction,
     Event,
     FeedBack,
     InternshipApplication,
+    Qualification,
     Vacancy,
     VacancyResponse,
     WorkPlace,
 )
 from internship.serializers import (
+    CalendarSubscriptionSerializer,
     CountSerializer,
+    DirectionSerializer,
     EventSerializer,
     FeedbackSerializer,
     InternshipApplicationSerializer,
+    QualificationSerializer,
     ReadEventSerializer,
     ReadFeedbackSerializer,
     ReadInternshipApplicationSerializer,
     ReadVacancyResponseSerializer,
     ReadVacancySerializer,
     ReadWorkPlaceSerializer,
+    SelectionResultSerializer,
     VacancyResponseSerializer,
     VacancySerializer,
     WorkPlaceSerializer,
 )
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
 
-class InternshipApplicationViewSet(viewsets.ModelViewSet):
-    queryset = InternshipApplication.objects.all()
+class InternshipApplicationViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
+    queryset = InternshipApplication.objects.order_by("pk")
     serializer_class = InternshipApplicationSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["is_recommended", "direction", "status", "applicant"]
@@ -49,7 +76,7 @@ class InternshipApplicationViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         if self.action == "create" or self.action == "destroy":
             return [permissions.IsAuthenticated(), IsCandidate()]
-        elif self.action == "update" or self.action == "partial_update":
+        elif self.action in ("update", "partial_update", "update_recommendations"):
             return [permissions.IsAuthenticated(), IsCurator()]
         return [permissions.IsAuthenticated()]
 
@@ -58,41 +85,59 @@ class InternshipApplicationViewSet(viewsets.ModelViewSet):
             return ReadInternshipApplicationSerializer
         return self.serializer_class
 
+    @extend_schema(
+        description="Пересчитать рекомендации по всем заявкам",
+        summary="Пересчитать рекомендации",
+        request=None,
+        responses={status.HTTP_200_OK: CountSerializer()},
+    )
+    @action(detail=False, methods=["POST"], url_path="update-recommendations")
+    def update_recommendations(self, request):
+        count = InternshipApplication.objects.update_recommendations()
+        return Response({"count": count}, status=status.HTTP_200_OK)
+
     @extend_schema(
         description="Закончить отбор",
         summary="Закончить отбор",
         request=None,
-        responses={status.HTTP_200_OK: CountSerializer()},
+        responses={status.HTTP_200_OK: SelectionResultSerializer()},
     )
     @action(detail=False, methods=["POST"], url_path="end-up-selection")
     def end_up_selection(self, request):
-        profiles = list(
-            TraineeProfile.objects.get_rating().prefetch_related("user__applications")
+        result = InternshipApplication.objects.end_up_selection(
+            settings.SELECTION_COUNT, changed_by_id=request.user.id
         )
-        updated_applications = []
-        updated_users = []
-        for profile in profiles[: settings.SELECTION_COUNT]:
-            profile.user.applications.status = InternshipApplication.Status.APPROVED
-            updated_applications.append(profile.user.applications)
-            profile.user.role = User.Role.TRAINEE
-            updated_users.append(profile.user)
-        for profile in profiles[settings.SELECTION_COUNT :]:
-            profile.user.applications.status = InternshipApplication.Status.REJECTED
-            updated_applications.append(profile.user.applications)
-        InternshipApplication.objects.bulk_update(
-            updated_applications, fields=["status"]
-        )
-        User.objects.bulk_update(updated_users, fields=["role"])
+        return Response(result, status=status.HTTP_200_OK)
+
 
-        return Response({"count": len(profiles)}, status=status.HTTP_200_OK)
+class DirectionViewSet(VersionedCacheMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Direction.objects.all()
+    serializer_class = DirectionSerializer
+    pagination_class = None
+    cache_models = [Direction]
 
 
-class VacancyViewSet(viewsets.ModelViewSet):
+class QualificationViewSet(VersionedCacheMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Qualification.objects.all()
+    serializer_class = QualificationSerializer
+    pagination_class = None
+    cache_models = [Qualification]
+
+
+class VacancyViewSet(EagerLoadingMixin, ScopedQuerysetMixin, viewsets.ModelViewSet):
     queryset = Vacancy.objects.all()
     serializer_class = VacancySerializer
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ["direction", "status", "reviewed_by", "department", "schedule"]
+    filterset_class = VacancyFilterSet
     permission_classes = [permissions.IsAuthenticated]
+    scopes = {
+        User.Role.CURATOR: all_rows,
+        User.Role.PERSONNEL: all_rows,
+        User.Role.TRAINEE: lambda user: Q(
+            status=Vacancy.Status.PUBLISHED,
+            direction_id=InternshipApplication.objects.get_direction_id(user.id),
+        ),
+    }
 
     def get_permission_classes(self):
         if self.action == "create" or self.action == "destroy":
@@ -109,22 +154,41 @@ class VacancyViewSet(viewsets.ModelViewSet):
             return ReadVacancySerializer
         return self.serializer_class
 
-    def get_queryset(self):
-        qs = self.queryset
-        if self.request.user.role == User.Role.TRAINEE:
-            return qs.filter(
-                status=Vacancy.Status.PUBLISHED,
-                direction=self.request.user.applications.direction,
+    def list(self, request, *args, **kwargs):
+        direction_id = None
+        if request.user.role == User.Role.TRAINEE:
+            direction_id = InternshipApplication.objects.get_direction_id(
+                request.user.id
             )
-        return qs
-
-
-class VacancyResponseViewSet(viewsets.ModelViewSet):
+        if direction_id is None:
+            return super().list(request, *args, **kwargs)
+
+        # All trainees of a direction see the same published vacancies
+        version = get_version(Vacancy, direction_id)
+        key = f"vacancy_feed:{direction_id}:{version}:{request.get_full_path()}"
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, settings.VACANCY_FEED_CACHE_TIMEOUT)
+        return response
+
+
+class VacancyResponseViewSet(
+    EagerLoadingMixin, ScopedQuerysetMixin, viewsets.ModelViewSet
+):
     queryset = VacancyResponse.objects.all()
     serializer_class = VacancyResponseSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["approved_by_mentor", "approved_by_applicant", "vacancy"]
+    scopes = {
+        User.Role.CURATOR: all_rows,
+        # Profiles share primary keys with their users
+        User.Role.TRAINEE: user_lookups(applicant_id="id"),
+        User.Role.MENTOR: user_lookups(vacancy__mentor_id="id"),
+        User.Role.PERSONNEL: user_lookups(vacancy__department_id="department_id"),
+    }
 
     def get_permission_classes(self):
         if self.action == "create" or self.action == "destroy":
@@ -146,23 +210,14 @@ class VacancyResponseViewSet(viewsets.ModelViewSet):
             return ReadVacancyResponseSerializer
         return self.serializer_class
 
-    def get_queryset(self):
-        qs = self.queryset
-        if self.action not in ("create", "update", "partial_update"):
-            qs.select_related("vacancy", "applicant")
-        if self.request.user.role == User.Role.TRAINEE:
-            return qs.filter(applicant=self.request.user.trainee_profile)
-        if self.request.user.role == User.Role.MENTOR:
-            return qs.filter(vacancy__mentor=self.request.user)
-        if self.request.user.role == User.Role.PERSONNEL:
-            return qs.filter(vacancy__department=self.request.user.department)
-        return qs
-
     @action(detail=True, methods=["GET"], url_path="by-vacancy")
     def by_vacancy(self, request, pk=None):
         try:
-            vacancy_response = VacancyResponse.objects.filter(
-                vacancy_id=pk, applicant_id=self.request.user.id
+            vacancy_response = eager_load(
+                VacancyResponse.objects.filter(
+                    vacancy_id=pk, applicant_id=self.request.user.id
+                ),
+                self.get_serializer(),
             ).get()
         except VacancyResponse.DoesNotExist:
             raise Http404
@@ -175,27 +230,27 @@ class VacancyResponseViewSet(viewsets.ModelViewSet):
         request=None,
     )
     @action(detail=True, methods=["POST"])
-    @transaction.atomic
     def approve(self, request, pk=None):
         vacancy_response: VacancyResponse = self.get_object()
-        work_place = WorkPlace.objects.create(
-            name=vacancy_response.vacancy.name,
-            vacancy_id=vacancy_response.vacancy_id,
-            trainee_id=vacancy_response.applicant_id,
-            mentor_id=vacancy_response.vacancy.mentor_id,
-            department_id=vacancy_response.vacancy.department_id,
-        )
-        vacancy_response.vacancy.status = Vacancy.Status.CLOSED
-        vacancy_response.vacancy.save()
+        work_place = vacancy_response.approve()
+        if work_place is None:
+            return Response(
+                {"detail": "Vacancy is already closed"},
+                status=status.HTTP_409_CONFLICT,
+            )
         serializer = self.get_serializer(work_place)
         return Response(data=serializer.data, status=status.HTTP_201_CREATED)
 
 
-class WorkPlaceViewSet(viewsets.ModelViewSet):
+class WorkPlacePagination(KeysetPagination):
+    ordering = ("id",)
+
+
+class WorkPlaceViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = WorkPlace.objects.all()
     serializer_class = WorkPlaceSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = None
+    pagination_class = WorkPlacePagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = [
         "is_active",
@@ -224,7 +279,10 @@ class WorkPlaceViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["GET"])
     def current(self, request):
-        work_place = request.user.current_work_place
+        work_place = eager_load(
+            WorkPlace.objects.filter(pk=request.user.current_work_place_id),
+            self.get_serializer(),
+        ).first()
         if work_place:
             serializer = self.get_serializer(work_place)
             return Response(data=serializer.data, status=status.HTTP_200_OK)
@@ -234,19 +292,25 @@ class WorkPlaceViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["GET"], url_path="by-trainee")
     def by_trainee(self, request, pk=None):
-        try:
-            work_place = WorkPlace.objects.filter(trainee_id=pk, is_active=True).get()
-        except WorkPlace.DoesNotExist:
+        work_place_id = WorkPlace.objects.get_current_id(pk, User.Role.TRAINEE)
+        work_place = eager_load(
+            WorkPlace.objects.filter(pk=work_place_id), self.get_serializer()
+        ).first()
+        if work_place is None:
             raise Http404
         serializer = self.get_serializer(work_place)
         return Response(data=serializer.data)
 
 
+class FeedBackPagination(KeysetPagination):
+    ordering = ("-date", "-id")
+
+
 class FeedBackViewSet(viewsets.ModelViewSet):
     queryset = FeedBack.objects.all()
     serializer_class = FeedbackSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = None
+    pagination_class = FeedBackPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = [
         "from_user",
@@ -271,12 +335,32 @@ class FeedBackViewSet(viewsets.ModelViewSet):
             return ReadFeedbackSerializer
         return self.serializer_class
 
+    @extend_schema(
+        description="Количество, сумма и средняя оценка отзывов о пользователе",
+        summary="Сводка отзывов о пользователе",
+        parameters=[OpenApiParameter("user", int, required=True)],
+        responses={status.HTTP_200_OK: FeedbackSummarySerializer()},
+    )
+    @action(detail=False, methods=["GET"])
+    def summary(self, request):
+        user_id = request.query_params.get("user", "")
+        if not user_id.isdigit():
+            raise ValidationError({"user": "A user id is required."})
+        user = User.objects.filter(pk=user_id).first()
+        if user is None:
+            raise Http404
+        return Response(FeedbackSummarySerializer(user).data)
+
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventPagination(KeysetPagination):
+    ordering = ("-datetime", "-id")
+
+
+class EventViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = None
+    pagination_class = EventPagination
     filter_backends = [DjangoFilterBackend]
     filterset_class = EventFilterSet
 
@@ -295,3 +379,72 @@ class EventViewSet(viewsets.ModelViewSet):
         if self.action not in ("update", "partial_update", "create"):
             return ReadEventSerializer
         return self.serializer_class
+
+    def get_calendar_etag(self, request):
+        # Any change of events or work places changes the versions, the token
+        # version changes with the role or department of the user
+        versions = ".".join(str(version) for version in get_versions(Event, WorkPlace))
+        user = request.user
+        key = f"{versions}:{user.id}:{user.token_version}:{request.get_full_path()}"
+        return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+    @extend_schema(
+        description=(
+            "События в формате iCalendar, принимает те же фильтры, что и список. "
+            "Поддерживает If-None-Match. Вместо заголовка Authorization можно "
+            "передать токен из ссылки для подписки"
+        ),
+        summary="Календарь событий",
+        parameters=[
+            OpenApiParameter(
+                CALENDAR_TOKEN_PARAM,
+                OpenApiTypes.STR,
+                description="Токен из ссылки для подписки на календарь",
+            )
+        ],
+        responses={(status.HTTP_200_OK, "text/calendar"): OpenApiTypes.STR},
+    )
+    @action(
+        detail=False,
+        methods=["GET"],
+        authentication_classes=[
+            CalendarTokenAuthentication,
+            *api_settings.DEFAULT_AUTHENTICATION_CLASSES,
+        ],
+    )
+    def calendar(self, request):
+        etag = self.get_calendar_etag(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            return response
+        # Without `filter_queryset`, rows are streamed without joins
+        events = (
+            DjangoFilterBackend()
+            .filter_queryset(request, self.get_queryset(), self)
+            .order_by("datetime", "id")
+            .values("id", "name", "description", "datetime")
+            .iterator(chunk_size=1000)
+        )
+        response = StreamingHttpResponse(
+            iter_calendar(events, domain=request.get_host().split(":")[0]),
+            content_type="text/calendar; charset=utf-8",
+        )
+        response["ETag"] = etag
+        response["Content-Disposition"] = 'inline; filename="calendar.ics"'
+        return response
+
+    @extend_schema(
+        description=(
+            "Ссылка на календарь событий с токеном пользователя для подписки "
+            "из календарных приложений. Токен отзывается при смене роли, "
+            "подразделения или блокировке пользователя"
+        ),
+        summary="Подписка на календарь событий",
+        responses={status.HTTP_200_OK: CalendarSubscriptionSerializer},
+    )
+    @action(detail=False, methods=["GET"], url_path="calendar-subscription")
+    def calendar_subscription(self, request):
+        url = request.build_absolute_uri(reverse("events-calendar"))
+        query = urlencode({CALENDAR_TOKEN_PARAM: make_calendar_token(request.user)})
+        serializer = CalendarSubscriptionSerializer({"url": f"{url}?{query}"})
+        return Response(serializer.data)
@@ -29,7 +29,8 @@ def test_candidate_statistics_api_view(
     assert "direction_statistics" in data
     assert "vacancies" in data
 
-    assert data["responses"] == {"total": 1, "relevant": 0, "irrelevant": 1}
+    # The education added after the application makes the candidate recommended
+    assert data["responses"] == {"total": 1, "relevant": 1, "irrelevant": 0}
 
     assert data["age_statistics"] == [
         {"label": 20, "count": 1},